@@ -1,33 +1,51 @@
 import os
+import logging
+import multiprocessing
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from services.auth import router as auth_router, start_cleanup_scheduler
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
+from fastapi.concurrency import run_in_threadpool
+from services.auth import router as auth_router, start_cleanup_scheduler, stop_cleanup_scheduler, close_smtp_connection, close_google_http_client
 from services.post import router as post_router
 from services.image import router as image_router
 from services.review import router as review_router
 from services.phishing import router as phishing_router
 from services.message import router as message_router
 from services.search import router as search_router
-from fastapi.staticfiles import StaticFiles
 import uvicorn
+import orjson
+from anyio import to_thread
 from dotenv import load_dotenv
 
-load_dotenv()
+if os.getenv("ENVIRONMENT") != "production":  # 운영 환경은 컨테이너 환경변수 사용
+    load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# 운영 환경에서는 API 문서(OpenAPI 스키마) 비활성화
+IS_PRODUCTION = os.getenv("ENVIRONMENT", "development") == "production"
+docs_url = None if IS_PRODUCTION else "/docs"
 
 app = FastAPI(
     title="Web Rating API",
     description="웹사이트 리뷰 및 피싱 사이트 신고 플랫폼 백엔드 API",
     version="1.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc"
+    docs_url=docs_url,
+    redoc_url=None if IS_PRODUCTION else "/redoc",
+    openapi_url=None if IS_PRODUCTION else "/openapi.json",
+    default_response_class=ORJSONResponse
 )
 
 # CORS 설정
 cors_origins = os.getenv("CORS_ORIGINS")
 if not cors_origins:
     raise RuntimeError("CORS_ORIGINS environment variable must be set")
-allowed_origins = [origin.strip() for origin in cors_origins.split(",")]
+allowed_origins = frozenset(origin.strip() for origin in cors_origins.split(",") if origin.strip())  # 요청마다 O(1) 조회
+cors_max_age = int(os.getenv("CORS_MAX_AGE", "86400"))  # Preflight 응답 캐시 시간 (초)
+
+# 동기(def) 엔드포인트를 실행하는 스레드풀 크기 (기본 40은 Supabase/SMTP 대기 중 쉽게 고갈됨)
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "100"))
 
 app.add_middleware(
     CORSMiddleware,
@@ -35,16 +53,44 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=cors_max_age,
 )
 
+# 응답 압축 (1KB 이상 JSON 응답만 압축)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # 전역 예외 처리
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
-    return JSONResponse(
+    # 상세 오류는 서버 로그에만 기록하고 클라이언트에는 노출하지 않음
+    logger.exception("Unhandled exception on %s %s", request.method, request.url.path)
+    return ORJSONResponse(
         status_code=500,
-        content={"detail": "Internal server error", "error": str(exc)}
+        content={"detail": "Internal server error"}
     )
 
+# 기본 라우트 응답 본문 (고정값이므로 시작 시 한 번만 직렬화)
+ROOT_RESPONSE_BODY = orjson.dumps({
+    "message": "Web Rating Backend API",
+    "version": "1.0.0",
+    "docs": docs_url,
+    "status": "running"
+})
+HEALTH_RESPONSE_BODY = orjson.dumps({
+    "status": "healthy",
+    "service": "web-rating-backend"
+})
+
+# 기본 라우트 (라우트는 등록 순서대로 매칭되므로 헬스체크 등 빈번한 경로를 먼저 등록)
+@app.get("/", tags=["Root"])
+async def read_root():
+    return Response(content=ROOT_RESPONSE_BODY, media_type="application/json")
+
+# 헬스 체크 엔드포인트
+@app.get("/health", tags=["Health"])
+async def health_check():
+    return Response(content=HEALTH_RESPONSE_BODY, media_type="application/json")
+
 # 라우터 등록
 app.include_router(auth_router, prefix="/auth", tags=["Authentication"])  # 로그인/회원가입/토큰 관리
 app.include_router(post_router, prefix="/posts", tags=["Posts"])  # 자유게시판 (게시물 작성/조회/수정/삭제)
@@ -60,28 +106,26 @@ app.include_router(search_router, prefix="/search", tags=["Search"])  # 통합 
 async def startup_event():
     """
     애플리케이션 시작 시 실행되는 이벤트
+    - 동기 엔드포인트용 스레드풀 크기 설정
     - TTL 기반 미인증 계정 자동 정리 스케줄러 시작
     """
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
     start_cleanup_scheduler()
 
-# 기본 라우트
-@app.get("/", tags=["Root"])
-def read_root():
-    return {
-        "message": "Web Rating Backend API",
-        "version": "1.0.0",
-        "docs": "/docs",
-        "status": "running"
-    }
-
-# 헬스 체크 엔드포인트
-@app.get("/health", tags=["Health"])
-def health_check():
-    return {
-        "status": "healthy",
-        "service": "web-rating-backend"
-    }
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    애플리케이션 종료 시 실행되는 이벤트
+    - 정리 작업 스케줄러 중지
+    - 재사용 중인 SMTP 연결 및 Google API 연결 종료
+    """
+    stop_cleanup_scheduler()
+    await run_in_threadpool(close_smtp_connection)  # SMTP QUIT은 블로킹 I/O
+    await close_google_http_client()
 
 # 실행 부분
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    # 로컬 실행용 (배포 환경의 워커 수는 docker-compose.yml/Dockerfile의 uvicorn 명령에서 UVICORN_WORKERS로 설정)
+    # uvloop/httptools는 설치되어 있으면 uvicorn이 자동으로 사용
+    workers = int(os.getenv("UVICORN_WORKERS", str(2 * multiprocessing.cpu_count() + 1)))
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, workers=workers) 
\ No newline at end of file
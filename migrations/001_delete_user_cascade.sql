@@ -0,0 +1,32 @@
+-- 계정 삭제 시 사용자 관련 데이터를 하나의 트랜잭션으로 연쇄 삭제
+-- 사용처: services/auth.py delete_account (DELETE /auth/me)
+-- 반환값: 사용자 행이 삭제되었으면 true, 해당 사용자가 없으면 false
+CREATE OR REPLACE FUNCTION public.delete_user_cascade(p_user_id integer)
+RETURNS boolean
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    deleted_count integer;
+BEGIN
+    -- 1. 투표 기록 삭제
+    DELETE FROM review_vote WHERE user_id = p_user_id;
+    DELETE FROM post_vote WHERE user_id = p_user_id;
+    DELETE FROM phishing_vote WHERE user_id = p_user_id;
+
+    -- 2. 댓글 삭제
+    DELETE FROM review_comment WHERE user_id = p_user_id;
+    DELETE FROM post_comment WHERE user_id = p_user_id;
+    DELETE FROM phishing_comment WHERE user_id = p_user_id;
+
+    -- 3. 게시물/리뷰/피싱 신고 삭제
+    DELETE FROM post WHERE user_id = p_user_id;
+    DELETE FROM review WHERE user_id = p_user_id;
+    DELETE FROM phishing_site WHERE user_id = p_user_id;
+
+    -- 4. 사용자 계정 삭제
+    DELETE FROM "user" WHERE id = p_user_id;
+    GET DIAGNOSTICS deleted_count = ROW_COUNT;
+
+    RETURN deleted_count > 0;
+END;
+$$;
@@ -0,0 +1,19 @@
+-- 인증 관련 조회 인덱스
+-- "user".username / email / google_id 는 UNIQUE 제약조건으로 이미 인덱스가 있으므로 별도 생성하지 않음
+
+-- 이메일 인증 코드 조회 (verify_email_verification_code, 인증/비밀번호 재설정)
+CREATE INDEX IF NOT EXISTS idx_email_verification_token_token
+    ON email_verification_token (token);
+
+-- 사용자별 기존 코드 삭제 (create_email_verification_code, 계정 정리)
+CREATE INDEX IF NOT EXISTS idx_email_verification_token_user_id
+    ON email_verification_token (user_id);
+
+-- 만료 코드 정리 (cleanup_expired_verification_tokens)
+CREATE INDEX IF NOT EXISTS idx_email_verification_token_expires_at
+    ON email_verification_token (expires_at);
+
+-- 미인증 계정 TTL 정리 및 현황 조회 (미인증 계정만 인덱싱하는 부분 인덱스)
+CREATE INDEX IF NOT EXISTS idx_user_unverified_created_at
+    ON "user" (created_at)
+    WHERE email_verified = false;
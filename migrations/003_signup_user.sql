@@ -0,0 +1,28 @@
+-- 회원가입 시 사용자 생성과 이메일 인증 코드 저장을 한 번의 호출(하나의 트랜잭션)로 처리
+-- 사용처: services/auth.py signup (POST /auth/signup)
+-- 인증 코드는 애플리케이션에서 암호학적 난수로 생성하여 전달
+-- 사용자명/이메일 중복 시 unique_violation 오류가 그대로 전달됨 (애플리케이션에서 duplicate key 처리)
+-- 반환값: 생성된 사용자 ID
+CREATE OR REPLACE FUNCTION public.signup_user(
+    p_username text,
+    p_email text,
+    p_password_hash text,
+    p_code text,
+    p_expires_at timestamptz
+)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    new_user_id integer;
+BEGIN
+    INSERT INTO "user" (username, email, password_hash, created_at, role, email_verified)
+    VALUES (p_username, p_email, p_password_hash, now(), 'user', false)
+    RETURNING id INTO new_user_id;
+
+    INSERT INTO email_verification_token (user_id, token, expires_at, created_at)
+    VALUES (new_user_id, p_code, p_expires_at, now());
+
+    RETURN new_user_id;
+END;
+$$;
@@ -0,0 +1,27 @@
+-- 이메일 인증 코드 검증, 계정 활성화, 사용된 코드 삭제를 한 번의 호출(하나의 트랜잭션)로 처리
+-- 사용처: services/auth.py verify_email_code_api (POST /auth/verify-email-code)
+-- 반환값: 인증된 사용자 ID, 코드가 없거나 만료된 경우 NULL (만료된 코드는 함께 삭제)
+CREATE OR REPLACE FUNCTION public.verify_email_code(p_code text)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_user_id integer;
+BEGIN
+    SELECT user_id INTO v_user_id
+    FROM email_verification_token
+    WHERE token = p_code AND expires_at > now()
+    ORDER BY created_at DESC
+    LIMIT 1;
+
+    IF v_user_id IS NULL THEN
+        DELETE FROM email_verification_token WHERE token = p_code AND expires_at <= now();
+        RETURN NULL;
+    END IF;
+
+    UPDATE "user" SET email_verified = true WHERE id = v_user_id;
+    DELETE FROM email_verification_token WHERE user_id = v_user_id;
+
+    RETURN v_user_id;
+END;
+$$;
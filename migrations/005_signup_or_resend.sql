@@ -0,0 +1,68 @@
+-- 회원가입 중복 확인, 오래된 미인증 계정 정리, 사용자/인증 코드 생성을 한 번의 호출(하나의 트랜잭션)로 처리
+-- 사용처: services/auth.py signup (POST /auth/signup)
+-- 003_signup_user.sql의 signup_user를 대체함
+--
+-- 반환값 (1행):
+--   action = 'username_taken' : 인증된 계정이 이미 같은 사용자명을 사용 중
+--   action = 'email_taken'    : 인증된 계정이 이미 같은 이메일을 사용 중
+--   action = 'existing'       : 사용자명/이메일이 모두 같은 미인증 계정 존재 (password_hash 반환, 비밀번호 확인은 애플리케이션에서 수행)
+--   action = 'created'        : 새 계정과 인증 코드(p_code) 생성 완료
+CREATE OR REPLACE FUNCTION public.signup_or_resend(
+    p_username text,
+    p_email text,
+    p_password_hash text,
+    p_code text,
+    p_expires_at timestamptz
+)
+RETURNS TABLE (action text, user_id integer, password_hash text)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+    existing record;
+    stale_ids integer[] := '{}';
+    new_user_id integer;
+BEGIN
+    -- 1. 사용자명 또는 이메일이 겹치는 계정 확인 (동시 가입 요청과 충돌하지 않도록 행 잠금)
+    FOR existing IN
+        SELECT u.id, u.username, u.email, u.email_verified, u.password_hash
+        FROM "user" u
+        WHERE u.username = p_username OR u.email = p_email
+        FOR UPDATE
+    LOOP
+        IF existing.email_verified THEN
+            IF existing.username = p_username THEN
+                RETURN QUERY SELECT 'username_taken'::text, existing.id, NULL::text;
+                RETURN;
+            END IF;
+            IF existing.email = p_email THEN
+                RETURN QUERY SELECT 'email_taken'::text, existing.id, NULL::text;
+                RETURN;
+            END IF;
+        ELSIF existing.username = p_username AND existing.email = p_email THEN
+            RETURN QUERY SELECT 'existing'::text, existing.id, existing.password_hash;
+            RETURN;
+        ELSE
+            stale_ids := stale_ids || existing.id;
+        END IF;
+    END LOOP;
+
+    -- 2. 사용자명/이메일 중 하나만 겹치는 다른 미인증 계정 삭제
+    IF array_length(stale_ids, 1) IS NOT NULL THEN
+        DELETE FROM email_verification_token t WHERE t.user_id = ANY(stale_ids);
+        DELETE FROM "user" u WHERE u.id = ANY(stale_ids);
+    END IF;
+
+    -- 3. 새 계정 및 인증 코드 생성
+    INSERT INTO "user" (username, email, password_hash, created_at, role, email_verified)
+    VALUES (p_username, p_email, p_password_hash, now(), 'user', false)
+    RETURNING id INTO new_user_id;
+
+    INSERT INTO email_verification_token (user_id, token, expires_at, created_at)
+    VALUES (new_user_id, p_code, p_expires_at, now());
+
+    RETURN QUERY SELECT 'created'::text, new_user_id, NULL::text;
+END;
+$$;
+
+DROP FUNCTION IF EXISTS public.signup_user(text, text, text, text, timestamptz);
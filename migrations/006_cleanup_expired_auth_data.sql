@@ -0,0 +1,28 @@
+-- 주기적 정리 작업: TTL이 지난 미인증 계정과 만료된 이메일 인증 코드를 한 번의 호출(하나의 트랜잭션)로 삭제
+-- 사용처: services/auth.py run_scheduled_cleanup (백그라운드 스케줄러)
+-- 반환값 (1행): users_deleted = 삭제된 미인증 계정 수, tokens_deleted = 삭제된 인증 코드 수 (삭제된 계정의 코드 포함)
+CREATE OR REPLACE FUNCTION public.cleanup_expired_auth_data(p_ttl_hours integer)
+RETURNS TABLE (users_deleted integer, tokens_deleted integer)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    expired_user_ids integer[];
+    v_users_deleted integer := 0;
+    v_tokens_deleted integer := 0;
+BEGIN
+    SELECT coalesce(array_agg(u.id), '{}') INTO expired_user_ids
+    FROM "user" u
+    WHERE u.email_verified = false
+      AND u.created_at < now() - make_interval(hours => p_ttl_hours);
+
+    -- 만료된 코드 + 삭제 대상 계정의 코드
+    DELETE FROM email_verification_token t
+    WHERE t.expires_at < now() OR t.user_id = ANY(expired_user_ids);
+    GET DIAGNOSTICS v_tokens_deleted = ROW_COUNT;
+
+    DELETE FROM "user" u WHERE u.id = ANY(expired_user_ids);
+    GET DIAGNOSTICS v_users_deleted = ROW_COUNT;
+
+    RETURN QUERY SELECT v_users_deleted, v_tokens_deleted;
+END;
+$$;
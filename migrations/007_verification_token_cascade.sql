@@ -0,0 +1,24 @@
+-- email_verification_token.user_id 외래키를 ON DELETE CASCADE로 변경
+-- 사용자 행을 삭제하면 인증 코드도 함께 삭제되므로, 계정 정리 시 코드를 따로 삭제하지 않아도 됨
+-- 사용처: services/auth.py cleanup_unverified_accounts
+DO $$
+DECLARE
+    fk_name text;
+BEGIN
+    -- 기존 외래키 제약조건 이름 조회 (테이블 생성 방식에 따라 이름이 다를 수 있음)
+    SELECT c.conname INTO fk_name
+    FROM pg_constraint c
+    JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = ANY(c.conkey)
+    WHERE c.conrelid = 'public.email_verification_token'::regclass
+      AND c.contype = 'f'
+      AND a.attname = 'user_id';
+
+    IF fk_name IS NOT NULL THEN
+        EXECUTE format('ALTER TABLE public.email_verification_token DROP CONSTRAINT %I', fk_name);
+    END IF;
+
+    ALTER TABLE public.email_verification_token
+        ADD CONSTRAINT email_verification_token_user_id_fkey
+        FOREIGN KEY (user_id) REFERENCES public."user"(id) ON DELETE CASCADE;
+END;
+$$;
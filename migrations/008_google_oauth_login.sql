@@ -0,0 +1,64 @@
+-- Google OAuth 로그인 사용자 조회/연동/생성을 한 번의 호출로 처리
+-- 사용처: services/auth.py get_or_create_google_user (POST /auth/google/callback)
+--
+-- 1. google_id가 같은 계정을 우선 찾고, 없으면 같은 이메일의 계정을 찾음
+-- 2. 이메일로 찾은 계정에 google_id가 없으면 연동
+-- 3. 계정이 없으면 사용자명 중복 시 숫자 접미사를 붙여(john -> john1, john2, ...) Google OAuth 전용 계정 생성
+--    (동시 로그인으로 unique 제약조건이 충돌하면 처음부터 다시 시도)
+--
+-- 반환값 (1행): id, username, email, role, email_verified, google_id
+CREATE OR REPLACE FUNCTION public.google_oauth_login(
+    p_google_id text,
+    p_email text,
+    p_base_username text
+)
+RETURNS TABLE (id integer, username text, email text, role text, email_verified boolean, google_id text)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+    found_user record;
+    candidate text;
+    suffix integer;
+BEGIN
+    LOOP
+        -- 1. 기존 사용자 확인 (google_id 매칭 우선)
+        SELECT u.id, u.google_id INTO found_user
+        FROM "user" u
+        WHERE u.google_id = p_google_id OR u.email = p_email
+        ORDER BY (u.google_id = p_google_id) IS TRUE DESC
+        LIMIT 1;
+
+        IF FOUND THEN
+            -- 2. 이메일로 찾은 기존 일반 계정에 Google ID 연동
+            IF found_user.google_id IS NULL THEN
+                UPDATE "user" u SET google_id = p_google_id WHERE u.id = found_user.id;
+            END IF;
+
+            RETURN QUERY
+            SELECT u.id, u.username, u.email, u.role, u.email_verified, u.google_id
+            FROM "user" u
+            WHERE u.id = found_user.id;
+            RETURN;
+        END IF;
+
+        -- 3. 사용 가능한 사용자명 선택 (후보마다 인덱스 조회, 네트워크 왕복 없음)
+        candidate := p_base_username;
+        suffix := 1;
+        WHILE EXISTS (SELECT 1 FROM "user" u WHERE u.username = candidate) LOOP
+            candidate := p_base_username || suffix;
+            suffix := suffix + 1;
+        END LOOP;
+
+        BEGIN
+            RETURN QUERY
+            INSERT INTO "user" (username, email, google_id, password_hash, created_at, role, email_verified)
+            VALUES (candidate, p_email, p_google_id, NULL, now(), 'user', true)
+            RETURNING id, username, email, role, email_verified, google_id;
+            RETURN;
+        EXCEPTION WHEN unique_violation THEN
+            NULL;  -- 동시에 같은 사용자명/이메일/google_id로 생성된 경우 다시 조회
+        END;
+    END LOOP;
+END;
+$$;
@@ -0,0 +1,4 @@
+-- 생성 시각은 애플리케이션이 아닌 DB 시각(now())으로 기록
+-- 사용처: services/auth.py create_email_verification_code (insert 시 created_at 생략)
+ALTER TABLE public.email_verification_token ALTER COLUMN created_at SET DEFAULT now();
+ALTER TABLE public."user" ALTER COLUMN created_at SET DEFAULT now();
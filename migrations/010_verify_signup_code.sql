@@ -0,0 +1,47 @@
+-- 회원가입 인증 완료: 코드 검증, 이메일 확인, 계정 활성화, 사용된 코드 삭제를 한 번의 호출(하나의 트랜잭션)로 처리
+-- 사용처: services/auth.py verify_signup (POST /auth/verify-signup)
+--
+-- 반환값 (1행):
+--   status = 'invalid_code'   : 코드가 없거나 만료됨
+--   status = 'user_not_found' : 코드에 해당하는 사용자가 없음
+--   status = 'email_mismatch' : 코드의 사용자 이메일이 요청 이메일과 다름 (계정은 변경하지 않음)
+--   status = 'verified'       : 인증 완료 (id, username, email, role 반환)
+CREATE OR REPLACE FUNCTION public.verify_signup_code(p_email text, p_code text)
+RETURNS TABLE (status text, id integer, username text, email text, role text)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+    v_user_id integer;
+    v_user record;
+BEGIN
+    SELECT t.user_id INTO v_user_id
+    FROM email_verification_token t
+    WHERE t.token = p_code AND t.expires_at > now()
+    LIMIT 1;
+
+    IF v_user_id IS NULL THEN
+        RETURN QUERY SELECT 'invalid_code'::text, NULL::integer, NULL::text, NULL::text, NULL::text;
+        RETURN;
+    END IF;
+
+    SELECT u.id, u.username, u.email, u.role INTO v_user
+    FROM "user" u
+    WHERE u.id = v_user_id;
+
+    IF NOT FOUND THEN
+        RETURN QUERY SELECT 'user_not_found'::text, NULL::integer, NULL::text, NULL::text, NULL::text;
+        RETURN;
+    END IF;
+
+    IF v_user.email <> p_email THEN
+        RETURN QUERY SELECT 'email_mismatch'::text, NULL::integer, NULL::text, NULL::text, NULL::text;
+        RETURN;
+    END IF;
+
+    UPDATE "user" u SET email_verified = true WHERE u.id = v_user_id;
+    DELETE FROM email_verification_token t WHERE t.user_id = v_user_id;
+
+    RETURN QUERY SELECT 'verified'::text, v_user.id, v_user.username, v_user.email, v_user.role;
+END;
+$$;
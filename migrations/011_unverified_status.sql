@@ -0,0 +1,12 @@
+-- 미인증 계정 현황 (전체 수와 TTL 만료 계정 수)을 한 번의 스캔으로 집계
+-- 사용처: services/auth.py get_unverified_accounts_status (GET /auth/admin/unverified-accounts-status)
+-- 반환값 (1행): total = 전체 미인증 계정 수, expired = created_at이 p_threshold 이전인 미인증 계정 수
+CREATE OR REPLACE FUNCTION public.unverified_status(p_threshold timestamptz)
+RETURNS TABLE (total bigint, expired bigint)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT count(*), count(*) FILTER (WHERE u.created_at < p_threshold)
+    FROM "user" u
+    WHERE u.email_verified = false;
+$$;
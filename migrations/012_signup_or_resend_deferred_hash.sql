@@ -0,0 +1,82 @@
+-- signup_or_resend 개선: 비밀번호 해시는 중복이 없을 때만 받고, 미인증 계정 재발송 시 인증 코드도 함께 교체
+-- 사용처: services/auth.py _signup (POST /auth/signup)
+-- 005_signup_or_resend.sql의 signup_or_resend를 대체함 (인자/반환 형식 동일)
+--
+-- p_password_hash가 NULL이면 중복 확인만 수행하고 계정을 생성하지 않음
+-- (애플리케이션은 'available'을 받은 뒤에만 bcrypt 해싱 후 해시와 함께 다시 호출)
+--
+-- 반환값 (1행):
+--   action = 'username_taken' : 인증된 계정이 이미 같은 사용자명을 사용 중
+--   action = 'email_taken'    : 인증된 계정이 이미 같은 이메일을 사용 중
+--   action = 'existing'       : 사용자명/이메일이 모두 같은 미인증 계정 존재, 인증 코드를 p_code로 교체함
+--                               (password_hash 반환, 비밀번호 확인은 애플리케이션에서 수행)
+--   action = 'available'      : 중복 없음 (p_password_hash가 NULL인 경우, 아무것도 변경하지 않음)
+--   action = 'created'        : 새 계정과 인증 코드(p_code) 생성 완료
+CREATE OR REPLACE FUNCTION public.signup_or_resend(
+    p_username text,
+    p_email text,
+    p_password_hash text,
+    p_code text,
+    p_expires_at timestamptz
+)
+RETURNS TABLE (action text, user_id integer, password_hash text)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+    existing record;
+    stale_ids integer[] := '{}';
+    new_user_id integer;
+BEGIN
+    -- 1. 사용자명 또는 이메일이 겹치는 계정 확인 (동시 가입 요청과 충돌하지 않도록 행 잠금)
+    FOR existing IN
+        SELECT u.id, u.username, u.email, u.email_verified, u.password_hash
+        FROM "user" u
+        WHERE u.username = p_username OR u.email = p_email
+        FOR UPDATE
+    LOOP
+        IF existing.email_verified THEN
+            IF existing.username = p_username THEN
+                RETURN QUERY SELECT 'username_taken'::text, existing.id, NULL::text;
+                RETURN;
+            END IF;
+            IF existing.email = p_email THEN
+                RETURN QUERY SELECT 'email_taken'::text, existing.id, NULL::text;
+                RETURN;
+            END IF;
+        ELSIF existing.username = p_username AND existing.email = p_email THEN
+            -- 재발송할 인증 코드로 교체
+            DELETE FROM email_verification_token t WHERE t.user_id = existing.id;
+            INSERT INTO email_verification_token (user_id, token, expires_at, created_at)
+            VALUES (existing.id, p_code, p_expires_at, now());
+
+            RETURN QUERY SELECT 'existing'::text, existing.id, existing.password_hash;
+            RETURN;
+        ELSE
+            stale_ids := stale_ids || existing.id;
+        END IF;
+    END LOOP;
+
+    -- 2. 중복 확인만 요청한 경우 (해시 계산 전 단계)
+    IF p_password_hash IS NULL THEN
+        RETURN QUERY SELECT 'available'::text, NULL::integer, NULL::text;
+        RETURN;
+    END IF;
+
+    -- 3. 사용자명/이메일 중 하나만 겹치는 다른 미인증 계정 삭제
+    IF array_length(stale_ids, 1) IS NOT NULL THEN
+        DELETE FROM email_verification_token t WHERE t.user_id = ANY(stale_ids);
+        DELETE FROM "user" u WHERE u.id = ANY(stale_ids);
+    END IF;
+
+    -- 4. 새 계정 및 인증 코드 생성
+    INSERT INTO "user" (username, email, password_hash, created_at, role, email_verified)
+    VALUES (p_username, p_email, p_password_hash, now(), 'user', false)
+    RETURNING id INTO new_user_id;
+
+    INSERT INTO email_verification_token (user_id, token, expires_at, created_at)
+    VALUES (new_user_id, p_code, p_expires_at, now());
+
+    RETURN QUERY SELECT 'created'::text, new_user_id, NULL::text;
+END;
+$$;
@@ -0,0 +1,54 @@
+-- 이메일 인증 코드 검증을 멱등하게 처리 (중복 클릭/재시도가 어느 워커로 가도 같은 성공 응답)
+-- 사용처: services/auth.py verify_email_code_api (POST /auth/verify-email-code)
+-- 004_verify_email_code.sql의 verify_email_code(text)를 대체함
+--
+-- 사용된 코드는 바로 삭제하지 않고 used_at을 기록한 뒤 만료 처리(expires_at = now())
+-- 다른 코드 조회(비밀번호 재설정, 회원가입 인증)는 expires_at > now() 조건으로 이미 제외하며,
+-- 남은 행은 cleanup_expired_auth_data가 만료된 코드와 함께 삭제
+--
+-- 반환값: 인증된 사용자 ID (p_replay_seconds 이내에 같은 코드로 인증된 경우 같은 ID),
+--         코드가 없거나 만료된 경우 NULL (만료된 코드는 함께 삭제)
+ALTER TABLE email_verification_token ADD COLUMN IF NOT EXISTS used_at timestamptz;
+
+CREATE OR REPLACE FUNCTION public.verify_email_code(p_code text, p_replay_seconds integer)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_user_id integer;
+BEGIN
+    -- 1. 유효한 코드 (동시 요청은 행 잠금으로 순서대로 처리, 뒤의 요청은 2번에서 재시도로 처리됨)
+    SELECT user_id INTO v_user_id
+    FROM email_verification_token
+    WHERE token = p_code AND expires_at > now()
+    ORDER BY created_at DESC
+    LIMIT 1
+    FOR UPDATE;
+
+    IF v_user_id IS NOT NULL THEN
+        UPDATE "user" SET email_verified = true WHERE id = v_user_id;
+        DELETE FROM email_verification_token WHERE user_id = v_user_id AND token <> p_code;
+        UPDATE email_verification_token
+        SET used_at = now(), expires_at = now()
+        WHERE user_id = v_user_id AND token = p_code;
+        RETURN v_user_id;
+    END IF;
+
+    -- 2. 방금 사용된 코드의 재요청
+    SELECT user_id INTO v_user_id
+    FROM email_verification_token
+    WHERE token = p_code AND used_at > now() - make_interval(secs => p_replay_seconds)
+    ORDER BY used_at DESC
+    LIMIT 1;
+
+    IF v_user_id IS NOT NULL THEN
+        RETURN v_user_id;
+    END IF;
+
+    -- 3. 없거나 만료된 코드
+    DELETE FROM email_verification_token WHERE token = p_code AND expires_at <= now();
+    RETURN NULL;
+END;
+$$;
+
+DROP FUNCTION IF EXISTS public.verify_email_code(text);
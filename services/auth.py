@@ -11,46 +11,101 @@
 import os
 import logging
 from dotenv import load_dotenv
-from fastapi import APIRouter, HTTPException, Depends, Response, Cookie, status
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, Cookie, BackgroundTasks, status
+from fastapi.responses import ORJSONResponse
+from starlette.background import BackgroundTask
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
-from passlib.context import CryptContext
-from datetime import datetime, timedelta
-from typing import Optional
-from pydantic import BaseModel, EmailStr, validator
+import jwt
+import bcrypt
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+from pydantic import BaseModel, EmailStr, field_validator
+from postgrest.types import CountMethod, ReturnMethod
+from postgrest.exceptions import APIError
 from .db import supabase
-import requests
+import httpx
+import re
 import secrets
+import string
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from email.header import Header
 import asyncio
+import queue
+import tempfile
 import threading
 import time
+import base64
+import hashlib
+import hmac
+import orjson
+from cachetools import TTLCache
+from cryptography.hazmat.primitives import serialization
+try:
+    import fcntl  # 워커 간 정리 작업 잠금용 (Windows 개발 환경에는 없음)
+except ImportError:
+    fcntl = None
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 # 환경변수 로드
-load_dotenv()
+if os.getenv("ENVIRONMENT") != "production":  # 운영 환경은 컨테이너 환경변수 사용
+    load_dotenv()
 
 # JWT 토큰 관련 설정
-_secret = os.getenv("SECRET_KEY")
-if not _secret:
-    raise RuntimeError("SECRET_KEY environment variable is not set")
-SECRET_KEY: str = _secret  # JWT 서명을 위한 비밀키
-ALGORITHM = os.getenv("ALGORITHM", "HS256")  # JWT 서명 알고리즘
+ALGORITHM = os.getenv("ALGORITHM", "HS256")  # JWT 서명 알고리즘 (HS256 기본, EdDSA/ES256/RS256 등 비대칭 알고리즘 선택 가능)
+JWT_ALGORITHMS = [ALGORITHM]  # 디코딩 시 허용할 알고리즘 목록
+_JWT_HMAC_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+
+# 환경변수의 PEM 키 로드 (한 줄로 입력한 경우 "\n"을 줄바꿈으로 복원)
+def _load_pem_env(name: str) -> bytes:
+    value = os.getenv(name)
+    if not value:
+        raise RuntimeError(f"{name} environment variable must be set when ALGORITHM={ALGORITHM}")
+    return value.replace("\\n", "\n").encode("utf-8")
+
+if ALGORITHM in _JWT_HMAC_DIGESTS:
+    _secret = os.getenv("SECRET_KEY")
+    if not _secret:
+        raise RuntimeError("SECRET_KEY environment variable is not set")
+    SECRET_KEY: str = _secret  # JWT 서명을 위한 비밀키
+    JWT_SIGNING_KEY = JWT_VERIFY_KEY = SECRET_KEY.encode("utf-8")  # 서명/검증용 키 바이트 (토큰마다 재인코딩하지 않도록 미리 변환)
+else:
+    # 비대칭 알고리즘: 개인키로 서명, 공개키로 검증 (PEM 파싱은 시작 시 한 번만 수행하고 키 객체를 재사용)
+    JWT_SIGNING_KEY = serialization.load_pem_private_key(_load_pem_env("JWT_PRIVATE_KEY"), password=None)
+    JWT_VERIFY_KEY = serialization.load_pem_public_key(_load_pem_env("JWT_PUBLIC_KEY"))
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))  # 액세스 토큰 만료시간
 REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))  # 리프레시 토큰 만료시간
+ACCESS_TOKEN_EXPIRE_SECONDS = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+REFRESH_TOKEN_EXPIRE_SECONDS = REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
 EMAIL_VERIFICATION_EXPIRE_HOURS = int(os.getenv("EMAIL_VERIFICATION_EXPIRE_HOURS", "24"))  # 이메일 인증 토큰 만료시간
+VERIFICATION_CODE_LENGTH = 6  # 이메일 인증 코드 길이
+VERIFICATION_CODE_ALPHABET = string.digits + string.ascii_uppercase  # 인증 코드 문자 집합 (숫자+대문자 영문)
+VERIFICATION_CODE_PATTERN = re.compile(rf"[0-9A-Za-z]{{{VERIFICATION_CODE_LENGTH}}}")  # 인증 코드 형식 (대소문자 무관, 시작 시 한 번만 컴파일)
 
 # TTL(Time To Live) 설정 - 미인증 계정 자동 삭제
 UNVERIFIED_ACCOUNT_TTL_HOURS = int(os.getenv("UNVERIFIED_ACCOUNT_TTL_HOURS", "24"))  # 미인증 계정 TTL (기본: 72시간)
 CLEANUP_SCHEDULE_HOURS = int(os.getenv("CLEANUP_SCHEDULE_HOURS", "6"))  # 정리 작업 주기 (기본: 6시간마다)
 
+# 인증 캐시 설정 - 검증된 액세스 토큰의 사용자 정보를 짧게 캐시하여 요청마다 DB 조회 방지
+AUTH_CACHE_TTL_SECONDS = int(os.getenv("AUTH_CACHE_TTL_SECONDS", "30"))  # 캐시 유지 시간 (초)
+AUTH_CACHE_MAXSIZE = int(os.getenv("AUTH_CACHE_MAXSIZE", "10000"))  # 최대 캐시 항목 수
+
+# PostgreSQL unique 제약조건 위반 오류 코드
+UNIQUE_VIOLATION = "23505"
+
 # 쿠키 보안 설정
 COOKIE_SECURE = os.getenv("ENVIRONMENT", "development") == "production"
+# 리프레시 토큰 쿠키 속성 (로그인/토큰 갱신/로그아웃 공통, 시작 시 한 번만 구성)
+REFRESH_COOKIE_DELETE_KWARGS = {
+    "key": "refresh_token",
+    "httponly": True,
+    "secure": COOKIE_SECURE,  # HTTPS에서만 전송
+    "samesite": "lax",  # CSRF 방지
+}
+REFRESH_COOKIE_KWARGS = {**REFRESH_COOKIE_DELETE_KWARGS, "max_age": REFRESH_TOKEN_EXPIRE_SECONDS}
 
 # SMTP 이메일 설정
 SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
@@ -58,6 +113,8 @@ SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
 SMTP_USERNAME = os.getenv("SMTP_USERNAME")
 SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
 FROM_EMAIL = os.getenv("FROM_EMAIL", SMTP_USERNAME)
+SMTP_TIMEOUT_SECONDS = 30  # SMTP 서버 응답 대기 타임아웃
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "4"))  # 워커당 유지할 최대 SMTP 연결 수
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
 
 
@@ -70,19 +127,91 @@ if not GOOGLE_CLIENT_ID or not GOOGLE_CLIENT_SECRET:
 
 # FastAPI 라우터 및 보안 설정
 router = APIRouter()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")  # 패스워드 해싱
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")  # OAuth2 스킴 (Bearer 토큰)
 
+# 검증된 JWT 페이로드 캐시 (토큰 해시 -> 페이로드), 액세스/리프레시 토큰 공용, 유효한 토큰만 저장
+# 인증 관련 캐시는 스레드풀에서 접근하므로 하나의 락으로 보호
+_jwt_payload_cache = TTLCache(maxsize=AUTH_CACHE_MAXSIZE, ttl=AUTH_CACHE_TTL_SECONDS)
+_auth_cache_lock = threading.Lock()
+
+# 사용자 프로필 캐시 (사용자 ID -> id/username/email/role/email_verified), /me 조회와 토큰 갱신마다 DB를 호출하지 않도록 짧게 캐시 (비밀번호 해시는 캐시하지 않음)
+_user_profile_cache = TTLCache(maxsize=AUTH_CACHE_MAXSIZE, ttl=AUTH_CACHE_TTL_SECONDS)
+
+# 토큰 무효화 시각 (사용자 ID -> epoch 초, 소수점 포함), 이 시각 이전에 발급된 액세스 토큰은 거부 (액세스 토큰 만료시간이 지나면 자동 제거)
+# 워커 프로세스별 메모리이므로 다른 워커에서는 사용자 프로필 캐시(AUTH_CACHE_TTL_SECONDS)가 만료된 뒤 DB 기준으로 반영됨
+_token_revoked_at = TTLCache(maxsize=AUTH_CACHE_MAXSIZE, ttl=ACCESS_TOKEN_EXPIRE_SECONDS)
+
+# 이메일 인증 코드 재요청 허용 시간 (초), 이 시간 안에 같은 코드를 다시 제출하면(중복 클릭, 재시도) 같은 성공 응답
+VERIFIED_CODE_DEDUPE_SECONDS = 60
+
+# 패스워드 해싱 설정 (bcrypt)
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))  # 해싱 비용 (기본값은 기존 passlib 기본값과 동일)
+BCRYPT_PREFIX = b"2b"  # 새로 생성하는 해시의 bcrypt 버전 식별자
+BCRYPT_MAX_PASSWORD_BYTES = 72
+
 # Google OAuth 2.0 API URLs
 GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
 GOOGLE_USERINFO_URL = "https://www.googleapis.com/oauth2/v2/userinfo"
+GOOGLE_API_TIMEOUT_SECONDS = 10  # Google API 호출 타임아웃
 
+# 진행 중인 Google 사용자 정보 조회 작업 (코드 해시 -> 사용자 정보를 반환하는 asyncio.Task)
+# 같은 콜백이 동시에 들어오면(React StrictMode 이중 호출 등) Google 호출 하나를 함께 기다림
+# 작업이 끝나면 즉시 제거하므로, 이미 사용된 코드를 다시 보내면 Google에서 거부됨 (invalid_grant)
+# 이벤트 루프에서만 접근하므로 락 불필요
+_google_user_info_inflight: Dict[bytes, "asyncio.Task[dict]"] = {}
+
+# Google API 호출용 공용 비동기 클라이언트 (keep-alive/HTTP2로 로그인마다 TCP/TLS 핸드셰이크 반복 방지, 이벤트 루프에서 직접 대기)
+google_http_client = httpx.AsyncClient(
+    http2=True,
+    timeout=GOOGLE_API_TIMEOUT_SECONDS,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+)
+
+async def close_google_http_client():
+    """애플리케이션 종료 시 Google API 연결 풀 종료"""
+    await google_http_client.aclose()
+
+# bcrypt는 최대 72바이트까지만 사용하므로 초과분은 잘라냄 (기존 passlib 동작과 동일)
+def _password_bytes(password: str) -> bytes:
+    return password.encode("utf-8")[:BCRYPT_MAX_PASSWORD_BYTES]
 # 평문 password, 해쉬된 password 비교하여 일치 여부 확인
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    if not hashed_password:  # Google OAuth 전용 계정 등 비밀번호가 없는 경우
+        return False
+    try:
+        return bcrypt.checkpw(_password_bytes(plain_password), hashed_password.encode("utf-8"))
+    except ValueError:  # 손상되었거나 bcrypt 형식이 아닌 해시
+        return False
 # password를 bcrypt로 해싱
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(_password_bytes(password), bcrypt.gensalt(rounds=BCRYPT_ROUNDS, prefix=BCRYPT_PREFIX)).decode("utf-8")
+# 저장된 해시의 버전/비용이 현재 설정과 다른지 확인 ("$2b$12$..." 형식)
+def password_needs_rehash(hashed_password: str) -> bool:
+    parts = hashed_password.split("$")
+    if len(parts) < 4:
+        return False  # bcrypt 형식이 아닌 해시는 검증 단계에서 이미 실패함
+    return parts[1] != BCRYPT_PREFIX.decode() or parts[2] != f"{BCRYPT_ROUNDS:02d}"
+# JWT 인코딩 (HMAC 알고리즘은 고정 헤더를 미리 인코딩해두고 orjson + hmac으로 직접 서명)
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+_JWT_HEADER_SEGMENT = _b64url(orjson.dumps({"alg": ALGORITHM, "typ": "JWT"})) + b"."
+_JWT_DIGEST = _JWT_HMAC_DIGESTS.get(ALGORITHM)
+
+def encode_jwt(payload: dict) -> str:
+    if _JWT_DIGEST is None:  # HMAC 이외의 알고리즘은 PyJWT 사용
+        return jwt.encode(payload, JWT_SIGNING_KEY, algorithm=ALGORITHM)
+    signing_input = _JWT_HEADER_SEGMENT + _b64url(orjson.dumps(payload))
+    signature = hmac.new(JWT_SIGNING_KEY, signing_input, _JWT_DIGEST).digest()
+    return (signing_input + b"." + _b64url(signature)).decode("ascii")
+# 액세스 토큰에 담을 사용자 정보 (클라이언트 표시용, 권한 판단은 get_current_user에서 사용자 프로필 기준으로 수행)
+def access_token_claims(user_row: dict) -> dict:
+    return {
+        "sub": str(user_row["id"]),
+        "role": user_row["role"],
+        "username": user_row["username"],
+        "email_verified": bool(user_row.get("email_verified")),
+    }
 # JWT 액세스 토큰 생성
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """
@@ -93,12 +222,18 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         str: 인코딩된 JWT 토큰
     """
     to_encode = data.copy()
-    expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    expires_in = int(expires_delta.total_seconds()) if expires_delta else ACCESS_TOKEN_EXPIRE_SECONDS
+    now = time.time()
+    to_encode["iat"] = now  # 발급 시각 (토큰 무효화 판단용, 같은 초에 무효화된 토큰도 구분하도록 소수점까지 기록)
+    to_encode["exp"] = int(now) + expires_in  # JWT 표준 NumericDate (epoch 초)
+    encoded_jwt = encode_jwt(to_encode)
     return encoded_jwt
 # JWT refresh token 생성
-# 이메일 인증 코드 생성 (6자리 숫자/영문 조합)
+# 6자리 코드 생성 (숫자+대문자 영문), 예측 불가능하도록 암호학적 난수 사용
+def generate_verification_code() -> str:
+    return ''.join(secrets.choice(VERIFICATION_CODE_ALPHABET) for _ in range(VERIFICATION_CODE_LENGTH))
+
+# 이메일 인증 코드 생성 및 저장 (6자리 숫자/영문 조합)
 def create_email_verification_code(user_id: int):
     """
     이메일 인증용 6자리 코드 생성
@@ -107,25 +242,19 @@ def create_email_verification_code(user_id: int):
     Returns:
         str: 6자리 인증 코드
     """
-    import string
-    import random
-    
-    # 6자리 코드 생성 (숫자+대문자 영문)
-    characters = string.digits + string.ascii_uppercase
-    code = ''.join(random.choices(characters, k=6))
-    expires_at = datetime.utcnow() + timedelta(hours=EMAIL_VERIFICATION_EXPIRE_HOURS)
+    code = generate_verification_code()
+    expires_at = datetime.now(timezone.utc) + timedelta(hours=EMAIL_VERIFICATION_EXPIRE_HOURS)
     
     # 데이터베이스에 코드 저장 (기존 코드가 있으면 덮어쓰기)
     try:
         # 기존 코드 삭제
-        supabase.table("email_verification_token").delete().eq("user_id", user_id).execute()
-        # 새 코드 삽입 (token 필드를 code로 재사용)
+        supabase.table("email_verification_token").delete(returning=ReturnMethod.minimal).eq("user_id", user_id).execute()
+        # 새 코드 삽입 (token 필드를 code로 재사용, created_at은 DB 기본값 now() 사용)
         supabase.table("email_verification_token").insert({
             "user_id": user_id,
             "token": code,  # code를 token 필드에 저장
-            "expires_at": expires_at.isoformat(),
-            "created_at": datetime.utcnow().isoformat()
-        }).execute()
+            "expires_at": expires_at.isoformat()
+        }, returning=ReturnMethod.minimal).execute()
         return code
     except Exception as e:
         logger.error(f"Failed to create email verification code: {str(e)}")
@@ -142,30 +271,147 @@ def verify_email_verification_code(code: str):
     """
     try:
         # 코드 형식 검증 (6자리 숫자+영문 대문자)
-        if not code or len(code) != 6 or not code.isalnum():
+        if not code or not VERIFICATION_CODE_PATTERN.fullmatch(code):
             return None
         
         # 대문자로 변환하여 검색 (대소문자 구분 없이)
         code = code.upper()
         
-        result = supabase.table("email_verification_token").select("user_id", "expires_at").eq("token", code).execute()
+        # 만료 여부는 DB에서 비교 (응답의 expires_at 문자열을 파싱하지 않음, 만료된 코드는 주기적 정리 작업에서 삭제)
+        now_iso = datetime.now(timezone.utc).isoformat()
+        result = supabase.table("email_verification_token").select("user_id").eq("token", code).gt("expires_at", now_iso).limit(1).execute()
         if not result.data:
             return None
         
-        code_data = result.data[0]
-        expires_at = datetime.fromisoformat(code_data["expires_at"].replace("Z", "+00:00"))
-        
-        # 코드 만료 확인
-        if datetime.utcnow().replace(tzinfo=expires_at.tzinfo) > expires_at:
-            # 만료된 코드 삭제
-            supabase.table("email_verification_token").delete().eq("token", code).execute()
-            return None
-        
-        return code_data["user_id"]
+        return result.data[0]["user_id"]
     except Exception as e:
         logger.error(f"Failed to verify email verification code: {str(e)}")
         return None
 
+# SMTP 연결 풀 (발송마다 TCP/STARTTLS/AUTH 핸드셰이크를 반복하지 않도록 연결 유지)
+# 슬롯은 None으로 시작하고 처음 사용할 때 연결을 생성, 동시 발송은 SMTP_POOL_SIZE개까지
+_smtp_pool: "queue.LifoQueue[Optional[smtplib.SMTP]]" = queue.LifoQueue(maxsize=SMTP_POOL_SIZE)  # 최근 사용한(살아있을 가능성이 높은) 연결부터 재사용
+for _ in range(SMTP_POOL_SIZE):
+    _smtp_pool.put(None)
+
+def _open_smtp_connection() -> smtplib.SMTP:
+    server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=SMTP_TIMEOUT_SECONDS)
+    server.starttls()
+    server.login(SMTP_USERNAME, SMTP_PASSWORD)
+    return server
+
+def _is_smtp_connection_alive(server: smtplib.SMTP) -> bool:
+    try:
+        return server.noop()[0] == 250
+    except (smtplib.SMTPException, OSError):
+        return False
+
+def _close_smtp_server(server: Optional[smtplib.SMTP]):
+    if server is None:
+        return
+    try:
+        server.quit()
+    except (smtplib.SMTPException, OSError):
+        server.close()  # QUIT 실패 시에도 소켓은 닫음
+
+def _send_smtp_message(recipient: str, message: bytes):
+    """풀에서 SMTP 연결을 빌려 메일 발송 (서버가 연결을 끊은 경우에만 재연결 후 1회 재시도)"""
+    server = _smtp_pool.get(timeout=SMTP_TIMEOUT_SECONDS)  # 모든 연결이 사용 중이면 반납될 때까지 대기
+    try:
+        if server is None or not _is_smtp_connection_alive(server):
+            _close_smtp_server(server)
+            server = _open_smtp_connection()
+        try:
+            # 빈 Return-Path로 반송 메일 완전 차단
+            server.sendmail("", [recipient], message)
+        except smtplib.SMTPServerDisconnected:
+            # 유휴 중 끊긴 연결만 재시도 (수신 거부 등 SMTP 오류나 발송 중 타임아웃은 중복 발송될 수 있으므로 재시도하지 않음)
+            _close_smtp_server(server)
+            server = _open_smtp_connection()
+            server.sendmail("", [recipient], message)
+    except Exception:
+        # 상태를 알 수 없는 연결은 버리고 빈 슬롯으로 반납
+        _close_smtp_server(server)
+        server = None
+        raise
+    finally:
+        _smtp_pool.put(server)
+
+def close_smtp_connection():
+    """애플리케이션 종료 시 풀에 유지 중인 SMTP 연결 종료"""
+    # 먼저 모든 슬롯을 꺼낸 뒤 종료 (LIFO 큐라 꺼내면서 다시 넣으면 방금 넣은 빈 슬롯만 다시 꺼내게 됨)
+    servers = []
+    while True:
+        try:
+            servers.append(_smtp_pool.get_nowait())
+        except queue.Empty:
+            break  # 발송 중인 연결은 발송 완료 후 프로세스 종료와 함께 정리됨
+    for server in servers:
+        _close_smtp_server(server)
+        _smtp_pool.put(None)
+
+# 메일 헤더 (수신자/제목/본문 외에는 고정값이므로 시작 시 한 번만 직렬화, email 패키지의 MIME 직렬화를 거치지 않음)
+_EMAIL_FROM_HEADER = b"From: " + (FROM_EMAIL or "").encode("utf-8") + b"\r\n"
+_EMAIL_FIXED_HEADERS = (
+    # 반송 메일 차단을 위한 헤더 설정
+    b"Return-Path: \r\n"  # 빈 Return-Path로 반송 메일 차단
+    b"Errors-To: \r\n"  # 에러 메일 차단
+    b"X-No-Bounce: 1\r\n"  # 반송 금지 플래그
+    b"Precedence: bulk\r\n"  # 대량 메일로 분류하여 반송 최소화
+    b"Auto-Submitted: auto-generated\r\n"  # 자동생성 메일 표시
+    b"X-Auto-Response-Suppress: All\r\n"  # 모든 자동응답 억제
+    b"List-Unsubscribe: <mailto:noreply@example.com>\r\n"  # 수신거부 처리
+    b"MIME-Version: 1.0\r\n"
+    b"Content-Type: text/plain; charset=\"utf-8\"\r\n"
+    b"Content-Transfer-Encoding: base64\r\n"
+    b"\r\n"
+)
+
+def _encode_subject_header(subject: str) -> bytes:
+    """한글 제목을 RFC 2047 인코딩된 Subject 헤더로 변환"""
+    return b"Subject: " + Header(subject, "utf-8").encode().encode("ascii") + b"\r\n"
+
+def _build_email_message(email: str, subject_header: bytes, body: str) -> bytes:
+    """반송 메일 차단 헤더가 설정된 메일 메시지 생성 (SMTP로 그대로 전송할 수 있는 바이트)"""
+    return b"".join((
+        _EMAIL_FROM_HEADER,
+        b"To: ", email.encode("utf-8"), b"\r\n",
+        subject_header,
+        _EMAIL_FIXED_HEADERS,
+        base64.encodebytes(body.encode("utf-8")).replace(b"\n", b"\r\n"),
+    ))
+
+# 메일 본문 템플릿 (시작 시 한 번만 생성, 만료시간은 설정값으로 미리 채움)
+VERIFICATION_EMAIL_TEMPLATE = string.Template(string.Template("""
+        안녕하세요 ${username}님,
+        
+        웹 리뷰 플랫폼에 가입해 주셔서 감사합니다.
+        아래 인증 코드를 웹사이트에 입력하여 이메일 주소를 인증해 주세요.
+        
+        인증 코드: ${code}
+        
+        이 코드는 ${expire_hours}시간 후에 만료됩니다.
+        보안을 위해 이 코드를 다른 사람과 공유하지 마세요.
+        
+        감사합니다.
+        """).safe_substitute(expire_hours=EMAIL_VERIFICATION_EXPIRE_HOURS))
+PASSWORD_RESET_EMAIL_TEMPLATE = string.Template(string.Template("""
+        안녕하세요 ${username}님,
+        
+        비밀번호 재설정을 요청하셨습니다.
+        아래 인증 코드를 웹사이트에 입력하여 비밀번호를 재설정해 주세요.
+        
+        인증 코드: ${code}
+        
+        이 코드는 ${expire_hours}시간 후에 만료됩니다.
+        만약 비밀번호 재설정을 요청하지 않으셨다면, 이 이메일을 무시해 주세요.
+        보안을 위해 이 코드를 다른 사람과 공유하지 마세요.
+        
+        감사합니다.
+        """).safe_substitute(expire_hours=EMAIL_VERIFICATION_EXPIRE_HOURS))
+VERIFICATION_EMAIL_SUBJECT = _encode_subject_header("이메일 주소 인증 코드")
+PASSWORD_RESET_EMAIL_SUBJECT = _encode_subject_header("비밀번호 재설정 인증 코드")
+
 # 이메일 인증 코드 전송 함수
 def send_verification_code_email(email: str, username: str, code: str):
     """
@@ -182,47 +428,9 @@ def send_verification_code_email(email: str, username: str, code: str):
         return True  # 실패해도 True 반환
     
     try:
-        # 이메일 내용 작성
-        msg = MIMEMultipart()
-        msg['From'] = FROM_EMAIL
-        msg['To'] = email
-        msg['Subject'] = "이메일 주소 인증 코드"
-        
-        # 반송 메일 차단을 위한 헤더 설정
-        msg['Return-Path'] = ""  # 빈 Return-Path로 반송 메일 차단
-        msg['Errors-To'] = ""   # 에러 메일 차단  
-        msg['X-No-Bounce'] = "1"  # 반송 금지 플래그
-        msg['Precedence'] = "bulk"  # 대량 메일로 분류하여 반송 최소화
-        msg['Auto-Submitted'] = "auto-generated"  # 자동생성 메일 표시
-        msg['X-Auto-Response-Suppress'] = "All"  # 모든 자동응답 억제
-        msg['List-Unsubscribe'] = "<mailto:noreply@example.com>"  # 수신거부 처리
-        
-        body = f"""
-        안녕하세요 {username}님,
-        
-        웹 리뷰 플랫폼에 가입해 주셔서 감사합니다.
-        아래 인증 코드를 웹사이트에 입력하여 이메일 주소를 인증해 주세요.
+        body = VERIFICATION_EMAIL_TEMPLATE.substitute(username=username, code=code)
         
-        인증 코드: {code}
-        
-        이 코드는 24시간 후에 만료됩니다.
-        보안을 위해 이 코드를 다른 사람과 공유하지 마세요.
-        
-        감사합니다.
-        """
-        
-        msg.attach(MIMEText(body, 'plain', 'utf-8'))
-        
-        # SMTP 서버 연결 및 이메일 발송 (반송 방지 옵션)
-        server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT)
-        server.starttls()
-        server.login(SMTP_USERNAME, SMTP_PASSWORD)
-        
-        # 반송 메일을 생성하지 않도록 설정
-        text = msg.as_string()
-        # 빈 Return-Path로 반송 메일 완전 차단
-        server.sendmail("", [email], text)
-        server.quit()
+        _send_smtp_message(email, _build_email_message(email, VERIFICATION_EMAIL_SUBJECT, body))
         
         logger.info(f"Verification code email sent to {email} (bounce suppressed)")
         return True
@@ -248,48 +456,9 @@ def send_password_reset_email(email: str, username: str, code: str):
         return True  # 실패해도 True 반환
     
     try:
-        # 이메일 내용 작성
-        msg = MIMEMultipart()
-        msg['From'] = FROM_EMAIL
-        msg['To'] = email
-        msg['Subject'] = "비밀번호 재설정 인증 코드"
-        
-        # 반송 메일 차단을 위한 헤더 설정
-        msg['Return-Path'] = ""  # 빈 Return-Path로 반송 메일 차단
-        msg['Errors-To'] = ""   # 에러 메일 차단  
-        msg['X-No-Bounce'] = "1"  # 반송 금지 플래그
-        msg['Precedence'] = "bulk"  # 대량 메일로 분류하여 반송 최소화
-        msg['Auto-Submitted'] = "auto-generated"  # 자동생성 메일 표시
-        msg['X-Auto-Response-Suppress'] = "All"  # 모든 자동응답 억제
-        msg['List-Unsubscribe'] = "<mailto:noreply@example.com>"  # 수신거부 처리
-        
-        body = f"""
-        안녕하세요 {username}님,
+        body = PASSWORD_RESET_EMAIL_TEMPLATE.substitute(username=username, code=code)
         
-        비밀번호 재설정을 요청하셨습니다.
-        아래 인증 코드를 웹사이트에 입력하여 비밀번호를 재설정해 주세요.
-        
-        인증 코드: {code}
-        
-        이 코드는 24시간 후에 만료됩니다.
-        만약 비밀번호 재설정을 요청하지 않으셨다면, 이 이메일을 무시해 주세요.
-        보안을 위해 이 코드를 다른 사람과 공유하지 마세요.
-        
-        감사합니다.
-        """
-        
-        msg.attach(MIMEText(body, 'plain', 'utf-8'))
-        
-        # SMTP 서버 연결 및 이메일 발송 (반송 방지 옵션)
-        server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT)
-        server.starttls()
-        server.login(SMTP_USERNAME, SMTP_PASSWORD)
-        
-        # 반송 메일을 생성하지 않도록 설정
-        text = msg.as_string()
-        # 빈 Return-Path로 반송 메일 완전 차단
-        server.sendmail("", [email], text)
-        server.quit()
+        _send_smtp_message(email, _build_email_message(email, PASSWORD_RESET_EMAIL_SUBJECT, body))
         
         logger.info(f"Password reset email sent to {email} (bounce suppressed)")
         return True
@@ -308,51 +477,26 @@ def cleanup_unverified_accounts():
     """
     try:
         # TTL 기준 시점 계산
-        ttl_threshold = datetime.utcnow() - timedelta(hours=UNVERIFIED_ACCOUNT_TTL_HOURS)
+        ttl_threshold = datetime.now(timezone.utc) - timedelta(hours=UNVERIFIED_ACCOUNT_TTL_HOURS)
         ttl_threshold_iso = ttl_threshold.isoformat()
         
-        # 만료된 미인증 계정 조회
-        expired_users_result = supabase.table("user").select("id", "username", "email", "created_at").eq("email_verified", False).lt("created_at", ttl_threshold_iso).execute()
+        # 만료된 미인증 계정을 한 번의 DELETE로 삭제하고 삭제된 행의 ID만 반환받음
+        # 관련 인증 코드는 외래키 ON DELETE CASCADE로 함께 삭제됨 (migrations/007_verification_token_cascade.sql)
+        delete_result = supabase.table("user").delete().eq("email_verified", False).lt("created_at", ttl_threshold_iso).select("id").execute()
         
-        if not expired_users_result.data:
+        if not delete_result.data:
             logger.info("No expired unverified accounts found for cleanup")
             return {"deleted_count": 0, "message": "No accounts to cleanup"}
         
-        deleted_count = 0
-        failed_count = 0
-        
-        for user in expired_users_result.data:
-            try:
-                user_id = user["id"]
-                username = user["username"]
-                email = user["email"]
-                created_at = user["created_at"]
-                
-                # 관련 인증 토큰 삭제
-                supabase.table("email_verification_token").delete().eq("user_id", user_id).execute()
-                
-                # 미인증 계정 삭제
-                delete_result = supabase.table("user").delete().eq("id", user_id).execute()
-                
-                if delete_result.data:
-                    deleted_count += 1
-                    logger.info(f"Deleted expired unverified account: {username} ({email}) - created: {created_at}")
-                else:
-                    failed_count += 1
-                    logger.warning(f"Failed to delete expired account: {username} ({email})")
-                    
-            except Exception as e:
-                failed_count += 1
-                logger.error(f"Error deleting expired account {user.get('username', 'unknown')}: {str(e)}")
-        
+        deleted_ids = [user["id"] for user in delete_result.data]
+        deleted_count = len(deleted_ids)
         result_message = f"Cleanup completed: {deleted_count} accounts deleted"
-        if failed_count > 0:
-            result_message += f", {failed_count} failed"
         
-        logger.info(result_message)
+        # 계정마다 로그를 남기지 않고 삭제된 ID 목록을 한 줄로 기록
+        logger.info("%s (user_ids=%s)", result_message, deleted_ids, extra={"user_ids": deleted_ids})
         return {
             "deleted_count": deleted_count,
-            "failed_count": failed_count,
+            "failed_count": 0,
             "message": result_message
         }
         
@@ -367,23 +511,16 @@ def cleanup_expired_verification_tokens():
     """
     try:
         # 만료된 토큰 삭제 (expires_at 기준)
-        current_time = datetime.utcnow().isoformat()
+        current_time = datetime.now(timezone.utc).isoformat()
         
-        # 만료된 토큰 조회 후 삭제
-        expired_tokens_result = supabase.table("email_verification_token").select("id", "user_id", "expires_at").lt("expires_at", current_time).execute()
+        # 만료된 토큰을 한 번의 DELETE로 삭제 (삭제된 행 대신 개수만 반환받음)
+        delete_result = supabase.table("email_verification_token").delete(count=CountMethod.exact, returning=ReturnMethod.minimal).lt("expires_at", current_time).execute()
+        deleted_count = delete_result.count or 0
         
-        if not expired_tokens_result.data:
+        if not deleted_count:
             logger.info("No expired verification tokens found for cleanup")
             return {"deleted_count": 0}
         
-        deleted_count = 0
-        for token in expired_tokens_result.data:
-            try:
-                supabase.table("email_verification_token").delete().eq("id", token["id"]).execute()
-                deleted_count += 1
-            except Exception as e:
-                logger.error(f"Failed to delete expired token {token['id']}: {str(e)}")
-        
         logger.info(f"Cleaned up {deleted_count} expired verification tokens")
         return {"deleted_count": deleted_count}
         
@@ -391,35 +528,64 @@ def cleanup_expired_verification_tokens():
         logger.error(f"Error cleaning up expired tokens: {str(e)}")
         return {"error": str(e), "deleted_count": 0}
 
-# 백그라운드 정리 작업 스케줄러
+# 예약 정리 작업 1회 실행 (미인증 계정 + 만료 토큰을 한 번의 DB 함수 호출로 삭제, migrations/006_cleanup_expired_auth_data.sql)
+def run_scheduled_cleanup():
+    try:
+        logger.info("Starting scheduled cleanup of unverified accounts and expired tokens")
+        result = supabase.rpc("cleanup_expired_auth_data", {"p_ttl_hours": UNVERIFIED_ACCOUNT_TTL_HOURS}).execute()
+        counts = result.data[0] if result.data else {}
+        logger.info(f"Scheduled cleanup completed - Accounts: {counts.get('users_deleted', 0)}, Tokens: {counts.get('tokens_deleted', 0)}")
+    except Exception as e:
+        logger.error(f"Error in scheduled cleanup: {str(e)}")
+
+# 백그라운드 정리 작업 스케줄러 (별도 스레드 대신 이벤트 루프의 태스크로 실행, DB 호출만 스레드풀에서 수행)
+_cleanup_task: Optional[asyncio.Task] = None
+# 여러 uvicorn 워커 중 하나만 스케줄러를 실행하도록 잠그는 파일 (잠금을 가진 워커가 종료되면 자동 해제)
+CLEANUP_LOCK_FILE = os.path.join(tempfile.gettempdir(), "web-rating-cleanup.lock")
+_cleanup_lock_file = None
+
+def _acquire_cleanup_lock() -> bool:
+    global _cleanup_lock_file
+    if fcntl is None:
+        return True  # 파일 잠금을 지원하지 않는 환경은 단일 워커로 실행한다고 가정
+    lock_file = open(CLEANUP_LOCK_FILE, "a")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+    _cleanup_lock_file = lock_file
+    return True
+
+async def _cleanup_loop():
+    while True:
+        await asyncio.to_thread(run_scheduled_cleanup)
+        # CLEANUP_SCHEDULE_HOURS 시간 대기
+        await asyncio.sleep(CLEANUP_SCHEDULE_HOURS * 3600)
+
 def start_cleanup_scheduler():
     """
-    백그라운드에서 주기적으로 정리 작업을 실행하는 스케줄러
+    백그라운드에서 주기적으로 정리 작업을 실행하는 스케줄러 (실행 중인 이벤트 루프에서 호출)
     """
-    def run_cleanup():
-        while True:
-            try:
-                logger.info("Starting scheduled cleanup of unverified accounts and expired tokens")
-                
-                # 미인증 계정 정리
-                account_cleanup_result = cleanup_unverified_accounts()
-                
-                # 만료된 토큰 정리
-                token_cleanup_result = cleanup_expired_verification_tokens()
-                
-                logger.info(f"Scheduled cleanup completed - Accounts: {account_cleanup_result.get('deleted_count', 0)}, Tokens: {token_cleanup_result.get('deleted_count', 0)}")
-                
-            except Exception as e:
-                logger.error(f"Error in scheduled cleanup: {str(e)}")
-            
-            # CLEANUP_SCHEDULE_HOURS 시간 대기
-            time.sleep(CLEANUP_SCHEDULE_HOURS * 3600)
-    
-    # 백그라운드 스레드로 실행
-    cleanup_thread = threading.Thread(target=run_cleanup, daemon=True)
-    cleanup_thread.start()
+    global _cleanup_task
+    if _cleanup_task is not None and not _cleanup_task.done():
+        return
+    if not _acquire_cleanup_lock():
+        logger.info("Cleanup scheduler already running in another worker")
+        return
+    _cleanup_task = asyncio.get_running_loop().create_task(_cleanup_loop())
     logger.info(f"Cleanup scheduler started - running every {CLEANUP_SCHEDULE_HOURS} hours, TTL: {UNVERIFIED_ACCOUNT_TTL_HOURS} hours")
 
+def stop_cleanup_scheduler():
+    """애플리케이션 종료 시 정리 작업 태스크 취소"""
+    global _cleanup_task, _cleanup_lock_file
+    if _cleanup_task is not None:
+        _cleanup_task.cancel()
+        _cleanup_task = None
+    if _cleanup_lock_file is not None:
+        _cleanup_lock_file.close()  # 파일을 닫으면 잠금 해제
+        _cleanup_lock_file = None
+
 def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None):
     """
     Args:
@@ -429,10 +595,20 @@ def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None):
         str: 인코딩된 JWT 리프레시 토큰
     """
     to_encode = data.copy()
-    expire = datetime.utcnow() + (expires_delta or timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS))
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    expires_in = int(expires_delta.total_seconds()) if expires_delta else REFRESH_TOKEN_EXPIRE_SECONDS
+    to_encode["exp"] = int(time.time()) + expires_in  # JWT 표준 NumericDate (epoch 초)
+    encoded_jwt = encode_jwt(to_encode)
     return encoded_jwt
+# 로그인 성공 시 발급할 액세스/리프레시 토큰 쌍 생성
+def create_token_pair(user_row: dict) -> tuple:
+    access_token = create_access_token(data=access_token_claims(user_row))
+    refresh_token = create_refresh_token(data={"sub": str(user_row["id"]), "role": user_row["role"]})
+    return access_token, refresh_token
+# 비동기 엔드포인트용 토큰 쌍 생성 (비대칭 알고리즘 서명은 CPU 비용이 커서 이벤트 루프 밖에서 실행, HMAC은 수 µs이므로 바로 실행)
+async def create_token_pair_async(user_row: dict) -> tuple:
+    if _JWT_DIGEST is None:
+        return await run_in_threadpool(create_token_pair, user_row)
+    return create_token_pair(user_row)
 # refresh token 유효성 검증
 def verify_refresh_token(token: str):
     """
@@ -442,51 +618,97 @@ def verify_refresh_token(token: str):
         int or None: 유효한 경우 사용자 ID, 무효한 경우 None
     """
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token_cached(token)
         user_id = payload.get("sub")
         if user_id is None:
             return None
         return int(user_id)
-    except (JWTError, ValueError):
+    except (jwt.PyJWTError, ValueError):
         return None
-# JWT 토큰에서 현재 사용자 정보 추출 (의존성 주입용)
-def get_current_user(token: str = Depends(oauth2_scheme)):
+# 토큰 원문 대신 고정 길이 해시를 캐시 키로 사용
+def _token_cache_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+# JWT 디코딩 및 검증 (최근 검증된 토큰은 서명 검증/JSON 파싱 생략, 토큰 만료시각까지만 유효)
+def decode_token_cached(token: str) -> dict:
+    """
+    Returns:
+        dict: 검증된 토큰 페이로드
+    Raises:
+        jwt.PyJWTError: 유효하지 않거나 만료된 토큰
+    """
+    cache_key = _token_cache_key(token)
+    with _auth_cache_lock:
+        payload = _jwt_payload_cache.get(cache_key)
+    if payload is not None:
+        if payload["exp"] <= time.time():
+            raise jwt.ExpiredSignatureError("Signature has expired")
+        return payload
+    
+    payload = jwt.decode(token, JWT_VERIFY_KEY, algorithms=JWT_ALGORITHMS)  # 실패 시 예외 발생 (유효하지 않은 토큰은 캐시하지 않음)
+    with _auth_cache_lock:
+        _jwt_payload_cache[cache_key] = payload
+    return payload
+
+# 사용자 정보 변경/삭제 시 해당 사용자의 인증 캐시 제거 및 기존 액세스 토큰 무효화 (클라이언트는 리프레시로 새 토큰 발급, revoke_tokens=False면 캐시만 제거)
+def invalidate_user_cache(user_id: int, revoke_tokens: bool = True):
+    with _auth_cache_lock:
+        if revoke_tokens:
+            _token_revoked_at[user_id] = time.time()
+        _user_profile_cache.pop(user_id, None)
+
+# JWT 토큰에서 사용자 정보 추출, 이메일 인증 여부는 확인하지 않음 (의존성 주입용, 인증 상태 조회 등)
+def get_authenticated_user(token: str = Depends(oauth2_scheme)):
     """
     Args:
         token: Bearer 토큰에서 추출된 JWT
     Returns:
-        dict: 사용자 정보 (id, username, role)
+        dict: 사용자 정보 (id, username, role, email_verified)
     """
     try:
-        # JWT 토큰 디코딩 및 검증
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        # JWT 토큰 디코딩 및 검증 (최근 검증된 토큰은 캐시된 페이로드 사용)
+        payload = decode_token_cached(token)
         user_id = payload.get("sub")
         role = payload.get("role")
         if user_id is None or role is None:
             raise HTTPException(status_code=401, detail="Invalid token")
-        
-        # 데이터베이스에서 사용자 정보 재확인 (보안 강화)
-        try:
-            user_result = supabase.table("user").select("id", "username", "role", "email_verified").eq("id", int(user_id)).execute()
-            if not user_result.data:
-                raise HTTPException(status_code=401, detail="User not found")
-            
-            user_row = user_result.data[0]
-            
-            # 이메일 인증 상태 확인
-            if not user_row.get("email_verified"):
-                raise HTTPException(
-                    status_code=403, 
-                    detail="Email verification required. Please complete email verification."
-                )
-            
-            return {"id": user_row["id"], "username": user_row["username"], "role": user_row["role"]}
-        except HTTPException:
-            raise
-        except Exception as e:
-            raise HTTPException(status_code=401, detail="User not found")
-    except (JWTError, ValueError):
+        user_id = int(user_id)
+    except (jwt.PyJWTError, ValueError):
         raise HTTPException(status_code=401, detail="Invalid token")
+    
+    # 사용자 정보 변경/삭제 이전에 발급된 토큰 거부
+    with _auth_cache_lock:
+        revoked_at = _token_revoked_at.get(user_id)
+    if revoked_at is not None and payload.get("iat", 0) < revoked_at:
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+    
+    # 권한/인증 상태는 토큰 클레임이 아닌 사용자 정보 기준으로 판단 (캐시에 없을 때만 DB 조회)
+    # 다른 워커에서의 변경이나 DB에서 직접 변경한 역할/계정 삭제도 AUTH_CACHE_TTL_SECONDS 안에 반영됨
+    try:
+        profile = get_user_profile(user_id)
+    except Exception:
+        raise HTTPException(status_code=401, detail="User not found")
+    if profile is None:
+        raise HTTPException(status_code=401, detail="User not found")
+    return {"id": profile["id"], "username": profile["username"], "role": profile["role"], "email_verified": profile["email_verified"]}
+
+# 이메일 인증을 완료한 현재 사용자 정보 (의존성 주입용)
+def get_current_user(current_user=Depends(get_authenticated_user)):
+    """
+    Args:
+        current_user: get_authenticated_user에서 반환된 사용자 정보
+    Returns:
+        dict: 사용자 정보 (id, username, role, email_verified)
+    Raises:
+        HTTPException: 이메일 미인증 사용자인 경우 403 에러
+    """
+    if not current_user["email_verified"]:
+        raise HTTPException(
+            status_code=403, 
+            detail="Email verification required. Please complete email verification."
+        )
+    
+    return current_user
 
 # 관리자 권한 확인 (의존성 주입용)
 def admin_required(current_user=Depends(get_current_user)):
@@ -502,6 +724,14 @@ def admin_required(current_user=Depends(get_current_user)):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="관리자 권한 필요")
     return current_user
 
+# 인증 코드 요청값 검증 (EmailVerificationCode, PasswordResetComplete, VerifySignup 공용)
+def _validate_verification_code(v: str) -> str:
+    if not v or len(v) != VERIFICATION_CODE_LENGTH:
+        raise ValueError('인증 코드는 6자리여야 합니다')
+    if not VERIFICATION_CODE_PATTERN.fullmatch(v):
+        raise ValueError('인증 코드는 숫자와 영문만 허용됩니다')
+    return v.upper()  # 대문자로 변환
+
 # Pydantic 모델 정의 (API 요청/응답 스키마)
 class UserCreate(BaseModel):
     """회원가입 요청 모델"""
@@ -509,7 +739,8 @@ class UserCreate(BaseModel):
     email: EmailStr
     password: str
     
-    @validator('username')
+    @field_validator('username')
+    @classmethod
     def validate_username(cls, v):
         """사용자명 유효성 검증: 3-20자, 영문/숫자만 허용"""
         if len(v) < 3 or len(v) > 20:
@@ -518,7 +749,8 @@ class UserCreate(BaseModel):
             raise ValueError('사용자명은 영문자와 숫자만 허용됩니다')
         return v
     
-    @validator('password')
+    @field_validator('password')
+    @classmethod
     def validate_password(cls, v):
         """패스워드 유효성 검증: 최소 8자"""
         if len(v) < 8:
@@ -541,7 +773,8 @@ class UserUpdate(BaseModel):
     username: str
     current_password: str
     
-    @validator('username')
+    @field_validator('username')
+    @classmethod
     def validate_username(cls, v):
         if len(v) < 3 or len(v) > 20:
             raise ValueError('사용자명은 3-20자 사이여야 합니다')
@@ -554,7 +787,8 @@ class PasswordChange(BaseModel):
     current_password: str
     new_password: str
     
-    @validator('new_password')
+    @field_validator('new_password')
+    @classmethod
     def validate_new_password(cls, v):
         if len(v) < 8:
             raise ValueError('새 비밀번호는 8자 이상이어야 합니다')
@@ -564,13 +798,10 @@ class EmailVerificationCode(BaseModel):
     """이메일 인증 코드 요청 모델"""
     code: str
     
-    @validator('code')
+    @field_validator('code')
+    @classmethod
     def validate_code(cls, v):
-        if not v or len(v) != 6:
-            raise ValueError('인증 코드는 6자리여야 합니다')
-        if not v.isalnum():
-            raise ValueError('인증 코드는 숫자와 영문만 허용됩니다')
-        return v.upper()  # 대문자로 변환
+        return _validate_verification_code(v)
 
 class PasswordResetRequest(BaseModel):
     """비밀번호 재설정 요청 모델 (이메일만 필요)"""
@@ -582,15 +813,13 @@ class PasswordResetComplete(BaseModel):
     code: str
     new_password: str
     
-    @validator('code')
+    @field_validator('code')
+    @classmethod
     def validate_code(cls, v):
-        if not v or len(v) != 6:
-            raise ValueError('인증 코드는 6자리여야 합니다')
-        if not v.isalnum():
-            raise ValueError('인증 코드는 숫자와 영문만 허용됩니다')
-        return v.upper()  # 대문자로 변환
+        return _validate_verification_code(v)
     
-    @validator('new_password')
+    @field_validator('new_password')
+    @classmethod
     def validate_new_password(cls, v):
         if len(v) < 8:
             raise ValueError('새 비밀번호는 8자 이상이어야 합니다')
@@ -603,13 +832,39 @@ class VerifySignup(BaseModel):
     email: EmailStr
     code: str
     
-    @validator('code')
+    @field_validator('code')
+    @classmethod
     def validate_code(cls, v):
-        if not v or len(v) != 6:
-            raise ValueError('인증 코드는 6자리여야 합니다')
-        if not v.isalnum():
-            raise ValueError('인증 코드는 숫자와 영문만 허용됩니다')
-        return v.upper()  # 대문자로 변환
+        return _validate_verification_code(v)
+
+# 동시에 들어온 동일 요청 병합 (더블클릭 등으로 같은 요청이 중복 도착하면 bcrypt/DB/메일 작업을 한 번만 수행)
+_inflight_calls: dict = {}  # 요청 키 -> {"done": Event, "result"/"error": 처리 결과}
+_inflight_calls_lock = threading.Lock()
+
+def _single_flight(key: tuple, func, *args):
+    """같은 키의 요청이 처리 중이면 새로 실행하지 않고 먼저 들어온 요청의 결과(또는 예외)를 함께 반환"""
+    with _inflight_calls_lock:
+        call = _inflight_calls.get(key)
+        is_leader = call is None
+        if is_leader:
+            call = _inflight_calls[key] = {"done": threading.Event()}
+    
+    if not is_leader:
+        call["done"].wait()
+        if "error" in call:
+            raise call["error"]
+        return call["result"]
+    
+    try:
+        call["result"] = func(*args)
+        return call["result"]
+    except Exception as e:
+        call["error"] = e
+        raise
+    finally:
+        with _inflight_calls_lock:
+            _inflight_calls.pop(key, None)
+        call["done"].set()
 
 # 임시 계정 생성 엔드포인트 (더 이상 사용하지 않음)
 @router.post("/signup-request")
@@ -622,131 +877,85 @@ def signup_request(user: UserCreate):
 
 # 회원가입 엔드포인트 (이메일 인증 필수)
 @router.post("/signup")
-def signup(user: UserCreate):
+def signup(user: UserCreate, background_tasks: BackgroundTasks):
     """
     회원가입 후 즉시 이메일 인증 필요
     - 계정을 생성하되 email_verified=False로 설정
-    - 인증 코드를 이메일로 발송
+    - 인증 코드를 이메일로 발송 (응답 후 백그라운드에서 발송)
     - 인증 완료 전까지 로그인 불가
+    - 같은 내용의 중복 요청이 동시에 들어오면 한 번만 처리하고 결과를 공유
     """
+    password_digest = hashlib.blake2b(user.password.encode("utf-8"), digest_size=16).digest()
+    return _single_flight(("signup", user.email, user.username, password_digest), _signup, user, background_tasks)
+
+# signup_or_resend DB 함수 호출 (password_hash가 None이면 중복 확인만 수행)
+def _call_signup_or_resend(user: UserCreate, password_hash: Optional[str], code: str, expires_at: datetime) -> dict:
+    try:
+        signup_result = supabase.rpc("signup_or_resend", {
+            "p_username": user.username,
+            "p_email": user.email,
+            "p_password_hash": password_hash,
+            "p_code": code,
+            "p_expires_at": expires_at.isoformat()
+        }).execute()
+    except APIError as signup_error:
+        # 동시에 같은 사용자명/이메일로 가입한 경우 unique 제약조건 위반
+        logger.error(f"Failed to create user: {signup_error.message}")
+        if signup_error.code == UNIQUE_VIOLATION:
+            conflict = f"{signup_error.message} {signup_error.details}"
+            if "username" in conflict:
+                raise HTTPException(status_code=400, detail="Username already registered")
+            raise HTTPException(status_code=400, detail="Email already registered")
+        raise HTTPException(status_code=500, detail="Failed to create user")
+    
+    if not signup_result.data:
+        raise HTTPException(status_code=500, detail="Failed to create user")
+    return signup_result.data[0]
+
+def _signup(user: UserCreate, background_tasks: BackgroundTasks):
     try:
-        # 1. 통합된 중복 체크 및 미인증 계정 처리
-        existing_users_result = supabase.table("user").select("*").or_(f"username.eq.{user.username},email.eq.{user.email}").execute()
-        
-        # 기존 계정 분석
-        existing_unverified_user = None
-        for existing_user in existing_users_result.data:
-            if existing_user.get("email_verified"):
-                # 인증된 계정이면 중복 에러
-                if existing_user["username"] == user.username:
-                    raise HTTPException(status_code=400, detail="Username already registered")
-                if existing_user["email"] == user.email:
-                    raise HTTPException(status_code=400, detail="Email already registered")
-            else:
-                # 정확히 같은 사용자명과 이메일을 가진 미인증 계정이 있는 경우
-                if existing_user["username"] == user.username and existing_user["email"] == user.email:
-                    existing_unverified_user = existing_user
-                    logger.info(f"Found exact matching unverified account: {user.username} ({user.email})")
-                    break
-                else:
-                    # 다른 미인증 계정들은 삭제
-                    try:
-                        supabase.table("email_verification_token").delete().eq("user_id", existing_user["id"]).execute()
-                        supabase.table("user").delete().eq("id", existing_user["id"]).execute()
-                        logger.info(f"Deleted unverified account: {existing_user['username']} ({existing_user['email']})")
-                    except Exception as delete_error:
-                        logger.warning(f"Failed to delete unverified account {existing_user['id']}: {str(delete_error)}")
-        
-        # 2. 기존 미인증 계정이 있다면 인증 코드만 재발송
-        if existing_unverified_user:
+        # 1. 중복 체크, 미인증 계정 코드 교체, 오래된 미인증 계정 정리, 새 계정/인증 코드 생성을 DB 함수로 처리
+        # (migrations/012_signup_or_resend_deferred_hash.sql)
+        # bcrypt 해싱은 중복이 없을 때만 수행 (먼저 해시 없이 호출해 중복 여부만 확인)
+        code = generate_verification_code()
+        expires_at = datetime.now(timezone.utc) + timedelta(hours=EMAIL_VERIFICATION_EXPIRE_HOURS)
+        
+        signup_row = _call_signup_or_resend(user, None, code, expires_at)
+        if signup_row["action"] == "available":
+            hashed_password = get_password_hash(user.password)
+            signup_row = _call_signup_or_resend(user, hashed_password, code, expires_at)
+        
+        action = signup_row["action"]
+        user_id = signup_row["user_id"]
+        
+        # 2. 인증된 계정과 중복
+        if action == "username_taken":
+            raise HTTPException(status_code=400, detail="Username already registered")
+        if action == "email_taken":
+            raise HTTPException(status_code=400, detail="Email already registered")
+        
+        # 3. 같은 사용자명/이메일의 미인증 계정이 있다면 인증 코드만 재발송 (새 코드는 DB 함수에서 이미 저장됨)
+        if action == "existing":
             # 패스워드 확인 (보안을 위해)
-            if not verify_password(user.password, existing_unverified_user["password_hash"]):
+            if not verify_password(user.password, signup_row["password_hash"]):
                 raise HTTPException(status_code=400, detail="Password mismatch for existing account")
             
-            user_id = existing_unverified_user["id"]
             logger.info(f"Resending verification code for existing unverified account: {user.username}")
-            
-            try:
-                code = create_email_verification_code(user_id)
-                send_verification_code_email(user.email, user.username, code)  # 이제 항상 True 반환
-                return {
-                    "message": "Verification code resent. Please check your email for verification code.",
-                    "email": user.email,
-                    "user_id": user_id
-                }
-            except Exception as e:
-                logger.error(f"Failed to resend verification code: {str(e)}")
-                # 이메일 발송 실패해도 성공 응답 (코드는 생성되어 있음)
-                return {
-                    "message": "Verification code resent. Please check your email for verification code.",
-                    "email": user.email,
-                    "user_id": user_id
-                }
-        
-        # 3. 새 계정 생성
-        hashed_password = get_password_hash(user.password)
-        created_at = datetime.utcnow().isoformat()
-        
-        try:
-            insert_result = supabase.table("user").insert({
-                "username": user.username,
-                "email": user.email,
-                "password_hash": hashed_password,
-                "created_at": created_at,
-                "role": "user",
-                "email_verified": False  # 이메일 인증 필수
-            }).execute()
-            
-            if not insert_result.data:
-                raise HTTPException(status_code=500, detail="Failed to create user")
-                
-        except Exception as insert_error:
-            logger.error(f"Failed to create user: {str(insert_error)}")
-            if "duplicate key" in str(insert_error).lower():
-                # 중복 키 에러가 발생하면 다시 한 번 미인증 계정 확인
-                retry_result = supabase.table("user").select("*").eq("username", user.username).eq("email", user.email).execute()
-                if retry_result.data and not retry_result.data[0].get("email_verified"):
-                    # 미인증 계정이 존재하면 인증 코드 재발송
-                    existing_user = retry_result.data[0]
-                    if verify_password(user.password, existing_user["password_hash"]):
-                        user_id = existing_user["id"]
-                        code = create_email_verification_code(user_id)
-                        if send_verification_code_email(user.email, user.username, code):
-                            return {
-                                "message": "Verification code resent. Please check your email for verification code.",
-                                "email": user.email,
-                                "user_id": user_id
-                            }
-                # 그 외의 경우 일반적인 중복 에러
-                if "username" in str(insert_error).lower():
-                    raise HTTPException(status_code=400, detail="Username already registered")
-                elif "email" in str(insert_error).lower():
-                    raise HTTPException(status_code=400, detail="Email already registered")
-            raise HTTPException(status_code=500, detail="Failed to create user")
-        
-        # 4. 인증 코드 생성 및 발송
-        user_id = None
-        try:
-            user_id = insert_result.data[0]["id"]
-            code = create_email_verification_code(user_id)
-            
-            # 이메일 발송 (실패해도 계정 유지하고 성공 응답)
-            send_verification_code_email(user.email, user.username, code)  # 이제 항상 True 반환
-            
+            background_tasks.add_task(send_verification_code_email, user.email, user.username, code)
             return {
-                "message": "User created successfully. Please check your email for verification code.",
+                "message": "Verification code resent. Please check your email for verification code.",
                 "email": user.email,
                 "user_id": user_id
             }
-                
-        except Exception as e:
-            logger.error(f"Failed to create verification code: {str(e)}")
-            # 계정은 생성되었으므로 성공 응답 (사용자가 나중에 인증 코드 재발송 가능)
-            return {
-                "message": "User created successfully. Please check your email for verification code.",
-                "email": user.email,
-                "user_id": user_id if 'user_id' in locals() else None
-            }
+        
+        # 4. 새 계정 생성 완료, 인증 코드 발송 (응답 후 백그라운드에서 발송, 실패해도 계정 유지)
+        background_tasks.add_task(send_verification_code_email, user.email, user.username, code)
+        
+        return {
+            "message": "User created successfully. Please check your email for verification code.",
+            "email": user.email,
+            "user_id": user_id
+        }
         
     except HTTPException:
         raise
@@ -762,43 +971,34 @@ def verify_signup(request: VerifySignup, response: Response):
     - 인증 코드 검증
     - 계정 활성화
     - 바로 로그인 토큰 반환 (쿠키 설정 포함)
+    - 같은 코드로 중복 요청이 동시에 들어오면 한 번만 처리하고 같은 토큰을 반환
     """
+    result, refresh_token = _single_flight(("verify-signup", request.email, request.code), _verify_signup, request)
+    
+    # 리프레시 토큰을 HttpOnly 쿠키로 설정 (병합된 요청도 각자의 응답에 설정)
+    response.set_cookie(value=refresh_token, **REFRESH_COOKIE_KWARGS)
+    return result
+
+def _verify_signup(request: VerifySignup):
     try:
-        # 1. 인증 코드 검증
-        user_id = verify_email_verification_code(request.code)
-        if not user_id:
+        # 1~4. 코드 검증, 이메일 확인, 계정 활성화, 사용된 코드 삭제를 한 번의 DB 함수 호출로 처리
+        # (migrations/010_verify_signup_code.sql)
+        verify_result = supabase.rpc("verify_signup_code", {"p_email": request.email, "p_code": request.code}).execute()
+        if not verify_result.data:
+            raise HTTPException(status_code=500, detail="Verification failed")
+        
+        user_data = verify_result.data[0]
+        verify_status = user_data["status"]
+        if verify_status == "invalid_code":
             raise HTTPException(status_code=400, detail="Invalid or expired verification code")
-        
-        # 2. 사용자 정보 조회
-        user_result = supabase.table("user").select("*").eq("id", user_id).execute()
-        if not user_result.data:
+        if verify_status == "user_not_found":
             raise HTTPException(status_code=400, detail="User not found")
-        
-        user_data = user_result.data[0]
-        
-        # 이메일 확인
-        if user_data["email"] != request.email:
+        if verify_status == "email_mismatch":
             raise HTTPException(status_code=400, detail="Email mismatch")
-        
-        # 3. 계정 활성화
-        supabase.table("user").update({"email_verified": True}).eq("id", user_id).execute()
-        
-        # 4. 사용된 인증 코드 삭제
-        supabase.table("email_verification_token").delete().eq("user_id", user_id).execute()
+        invalidate_user_cache(user_data["id"], revoke_tokens=False)  # 캐시된 미인증 상태 제거 (기존 토큰은 계속 사용 가능)
         
         # 5. 로그인 토큰 생성
-        access_token = create_access_token(data={"sub": str(user_id), "role": user_data["role"]})
-        refresh_token = create_refresh_token(data={"sub": str(user_id), "role": user_data["role"]})
-        
-        # 6. 리프레시 토큰을 HttpOnly 쿠키로 설정
-        response.set_cookie(
-            key="refresh_token",
-            value=refresh_token,
-            httponly=True,
-            secure=COOKIE_SECURE,
-            samesite="lax",
-            max_age=REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
-        )
+        access_token, refresh_token = create_token_pair({**user_data, "email_verified": True})
         
         return {
             "message": "Email verification successful. Welcome!",
@@ -810,7 +1010,7 @@ def verify_signup(request: VerifySignup, response: Response):
                 "email": user_data["email"],
                 "role": user_data["role"]
             }
-        }
+        }, refresh_token
         
     except HTTPException:
         raise
@@ -822,7 +1022,7 @@ def verify_signup(request: VerifySignup, response: Response):
 def login(user: UserLogin, response: Response):
     try:
         # 1. 이메일로 사용자 검색
-        user_result = supabase.table("user").select("*").eq("email", user.email).execute()
+        user_result = supabase.table("user").select("id", "username", "email", "role", "email_verified", "password_hash").eq("email", user.email).execute()
         if not user_result.data:
             raise HTTPException(status_code=401, detail="Incorrect email or password")
         
@@ -831,24 +1031,32 @@ def login(user: UserLogin, response: Response):
         if not verify_password(user.password, user_row["password_hash"]):
             raise HTTPException(status_code=401, detail="Incorrect email or password")
         
+        # 해싱 비용 설정이 바뀐 경우 로그인 성공 시 새 설정으로 재해싱 (실패해도 로그인은 계속 진행)
+        if password_needs_rehash(user_row["password_hash"]):
+            try:
+                supabase.table("user").update({"password_hash": get_password_hash(user.password)}, returning=ReturnMethod.minimal).eq("id", user_row["id"]).execute()
+            except Exception as e:
+                logger.warning(f"Failed to rehash password for user {user_row['id']}: {str(e)}")
+        
         # 3. 이메일 인증 상태 확인
         if not user_row.get("email_verified"):
-            # 미인증 사용자에게 인증 코드 자동 발송
+            # 미인증 사용자에게 인증 코드 자동 발송 (응답 후 백그라운드에서 발송)
+            # HTTPException을 발생시키면 백그라운드 작업이 실행되지 않으므로 403 응답을 직접 반환
             verification_code_sent = False
+            send_task = None
             try:
                 code = create_email_verification_code(user_row["id"])
-                if send_verification_code_email(user_row["email"], user_row["username"], code):
-                    verification_code_sent = True
-                    logger.info(f"Verification code automatically sent to unverified user: {user_row['email']}")
-                else:
-                    logger.warning(f"Failed to send verification code to: {user_row['email']}")
+                send_task = BackgroundTask(send_verification_code_email, user_row["email"], user_row["username"], code)
+                verification_code_sent = True
+                logger.info(f"Verification code automatically queued for unverified user: {user_row['email']}")
             except Exception as e:
-                logger.error(f"Failed to send verification code during login: {str(e)}")
+                logger.error(f"Failed to create verification code during login: {str(e)}")
             
-            # 사용자에게 일관된 응답 제공
-            raise HTTPException(
-                status_code=403, 
-                detail={
+            # 사용자에게 일관된 응답 제공 (HTTPException과 같은 {"detail": ...} 형식)
+            return ORJSONResponse(
+                status_code=403,
+                background=send_task,
+                content={"detail": {
                     "error": "email_verification_required",
                     "message": "Email verification required to login." + (
                         " A verification code has been sent to your email." if verification_code_sent 
@@ -857,22 +1065,14 @@ def login(user: UserLogin, response: Response):
                     "action": "verification_code_sent" if verification_code_sent else "verification_required",
                     "email": user_row["email"],
                     "user_id": user_row["id"]
-                }
+                }}
             )
         
         # 4. JWT 토큰 생성
-        access_token = create_access_token(data={"sub": str(user_row["id"]), "role": user_row["role"]})
-        refresh_token = create_refresh_token(data={"sub": str(user_row["id"]), "role": user_row["role"]})
+        access_token, refresh_token = create_token_pair(user_row)
         
         # 5. 리프레시 토큰을 HttpOnly 쿠키로 설정 
-        response.set_cookie(
-            key="refresh_token",
-            value=refresh_token,
-            httponly=True, 
-            secure=COOKIE_SECURE,  # HTTPS에서만 전송
-            samesite="lax",  # CSRF 방지
-            max_age=REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
-        )
+        response.set_cookie(value=refresh_token, **REFRESH_COOKIE_KWARGS)
         
         return {
             "access_token": access_token,
@@ -883,6 +1083,71 @@ def login(user: UserLogin, response: Response):
     except Exception as e:
         raise HTTPException(status_code=401, detail="Incorrect email or password")
 
+# Google 계정에 해당하는 사용자 조회 또는 생성 (동기 함수, google_callback에서 스레드풀로 호출)
+def get_or_create_google_user(google_id: str, email: str, name: Optional[str]) -> dict:
+    """
+    google_id 또는 email로 기존 사용자를 찾고, 없으면 Google OAuth 전용 계정을 생성
+    - 조회, 기존 계정 Google ID 연동, 사용자명 중복 처리(john -> john1, john2, ...), 계정 생성을
+      한 번의 DB 함수 호출로 처리 (migrations/008_google_oauth_login.sql)
+    Returns:
+        dict: 사용자 정보 (id, username, email, role, email_verified, google_id)
+    """
+    base_username = name or email.split("@")[0]
+    try:
+        login_result = supabase.rpc("google_oauth_login", {
+            "p_google_id": google_id,
+            "p_email": email,
+            "p_base_username": base_username
+        }).execute()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to create user: {str(e)}")
+    
+    if not login_result.data:
+        raise HTTPException(status_code=500, detail="User creation failed")
+    
+    user_row = login_result.data[0]
+    cache_user_profile(user_row)  # Google ID 연동/이메일 인증 처리로 바뀐 사용자 정보 반영
+    return user_row
+
+# Authorization code를 Google access token으로 교환한 뒤 사용자 정보 조회
+async def fetch_google_user_info(code: str, redirect_uri: str) -> dict:
+    # 1. Authorization code를 access token으로 교환
+    token_data = {
+        "client_id": GOOGLE_CLIENT_ID,
+        "client_secret": GOOGLE_CLIENT_SECRET,
+        "code": code,
+        "grant_type": "authorization_code",
+        "redirect_uri": redirect_uri
+    }
+    
+    logger.info("Exchanging authorization code for access token")
+    token_response = await google_http_client.post(GOOGLE_TOKEN_URL, data=token_data)
+    
+    if token_response.status_code != 200:
+        error_response = token_response.json()
+        error_detail = error_response.get("error_description", error_response.get("error", "Unknown error"))
+        logger.error(f"Token exchange failed: {error_detail}")
+        raise HTTPException(status_code=400, detail=f"Failed to exchange authorization code: {error_detail}")
+    
+    token_info = token_response.json()
+    google_access_token = token_info.get("access_token")
+    if not google_access_token:
+        logger.error("No access token received from Google")
+        raise HTTPException(status_code=400, detail="No access token received from Google")
+    
+    logger.info("Successfully received access token from Google")
+    
+    # 2. Access token으로 사용자 정보 가져오기
+    logger.info("Getting user info from Google")
+    headers = {"Authorization": f"Bearer {google_access_token}"}
+    userinfo_response = await google_http_client.get(GOOGLE_USERINFO_URL, headers=headers)
+    
+    if userinfo_response.status_code != 200:
+        logger.error("Failed to get user info from Google")
+        raise HTTPException(status_code=400, detail="Failed to get user info from Google")
+    
+    return userinfo_response.json()
+
 # Google OAuth 콜백 처리 엔드포인트
 @router.post("/google/callback")
 async def google_callback(request: GoogleCallbackRequest, response: Response):
@@ -900,42 +1165,16 @@ async def google_callback(request: GoogleCallbackRequest, response: Response):
     try:
         logger.info("Google OAuth callback received")
         
-        # 1. Authorization code를 access token으로 교환
-        token_data = {
-            "client_id": GOOGLE_CLIENT_ID,
-            "client_secret": GOOGLE_CLIENT_SECRET,
-            "code": request.code,
-            "grant_type": "authorization_code",
-            "redirect_uri": request.redirect_uri
-        }
-        
-        logger.info("Exchanging authorization code for access token")
-        token_response = requests.post(GOOGLE_TOKEN_URL, data=token_data)
-        
-        if token_response.status_code != 200:
-            error_response = token_response.json()
-            error_detail = error_response.get("error_description", error_response.get("error", "Unknown error"))
-            logger.error(f"Token exchange failed: {error_detail}")
-            raise HTTPException(status_code=400, detail=f"Failed to exchange authorization code: {error_detail}")
-        
-        token_info = token_response.json()
-        google_access_token = token_info.get("access_token")
-        if not google_access_token:
-            logger.error("No access token received from Google")
-            raise HTTPException(status_code=400, detail="No access token received from Google")
-        
-        logger.info("Successfully received access token from Google")
-        
-        # 2. Access token으로 사용자 정보 가져오기
-        logger.info("Getting user info from Google")
-        headers = {"Authorization": f"Bearer {google_access_token}"}
-        userinfo_response = requests.get(GOOGLE_USERINFO_URL, headers=headers)
-        
-        if userinfo_response.status_code != 200:
-            logger.error("Failed to get user info from Google")
-            raise HTTPException(status_code=400, detail="Failed to get user info from Google")
-        
-        user_info = userinfo_response.json()
+        # 1~2. 인증 코드로 Google 사용자 정보 조회
+        # 같은 코드의 조회가 진행 중이면 Google을 다시 호출하지 않고 그 결과를 함께 사용
+        inflight_key = _token_cache_key(f"{request.code}\n{request.redirect_uri}")
+        user_info_task = _google_user_info_inflight.get(inflight_key)
+        if user_info_task is None:
+            user_info_task = asyncio.ensure_future(fetch_google_user_info(request.code, request.redirect_uri))
+            _google_user_info_inflight[inflight_key] = user_info_task
+            # 성공/실패와 관계없이 작업이 끝나면 제거 (완료된 결과는 다음 요청에 재사용하지 않음)
+            user_info_task.add_done_callback(lambda _: _google_user_info_inflight.pop(inflight_key, None))
+        user_info = await asyncio.shield(user_info_task)
         google_id = user_info.get("id")
         email = user_info.get("email")
         name = user_info.get("name")
@@ -946,79 +1185,14 @@ async def google_callback(request: GoogleCallbackRequest, response: Response):
             logger.error("Invalid user info from Google")
             raise HTTPException(status_code=400, detail="Invalid user info from Google")
         
-        # 3. 사용자명 생성 및 중복 처리
-        base_username = name or email.split("@")[0]
-        username = base_username
-        
-        # 사용자명 중복 시 숫자 접미사 추가 (예: john -> john1, john2, ...)
-        counter = 1
-        while True:
-            try:
-                existing_user = supabase.table("user").select("id").eq("username", username).execute()
-                if not existing_user.data:
-                    break
-                username = f"{base_username}{counter}"
-                counter += 1
-            except Exception:
-                break
-        
-        # 4. 기존 사용자 확인 (2단계 검색: google_id -> email)
-        user_row = None
-        
-        # 4-1. Google ID로 먼저 확인 (가장 정확한 매칭)
-        try:
-            user_result = supabase.table("user").select("*").eq("google_id", google_id).execute()
-            if user_result.data:
-                user_row = user_result.data[0]
-        except Exception:
-            pass
-        
-        # 4-2. Google ID로 찾지 못한 경우 이메일로 확인
-        if not user_row:
-            try:
-                user_result = supabase.table("user").select("*").eq("email", email).execute()
-                if user_result.data:
-                    user_row = user_result.data[0]
-                    # 기존 일반 계정에 Google ID 연동
-                    if not user_row.get("google_id"):
-                        supabase.table("user").update({"google_id": google_id}).eq("id", user_row["id"]).execute()
-                        user_row["google_id"] = google_id
-            except Exception:
-                pass
-        
-        # 5. 신규 사용자 생성 (Google OAuth 전용 계정)
-        if not user_row:
-            created_at = datetime.utcnow().isoformat()
-            try:
-                insert_result = supabase.table("user").insert({
-                    "username": username,
-                    "email": email,
-                    "google_id": google_id,
-                    "password_hash": None,  # Google OAuth 사용자는 패스워드 없음
-                    "created_at": created_at,
-                    "role": "user",  # 기본 역할
-                    "email_verified": True  # Google OAuth 사용자는 이미 이메일 인증됨
-                }).execute()
-                if insert_result.data:
-                    user_row = insert_result.data[0]
-                else:
-                    raise HTTPException(status_code=500, detail="User creation failed")
-            except Exception as e:
-                raise HTTPException(status_code=500, detail=f"Failed to create user: {str(e)}")
+        # 3~5. 기존 사용자 확인 또는 신규 사용자 생성 (동기 DB 호출이므로 스레드풀에서 실행하여 이벤트 루프 차단 방지)
+        user_row = await run_in_threadpool(get_or_create_google_user, google_id, email, name)
         
         # 6. JWT 토큰 발급 및 응답
-        jwt_access_token = create_access_token(data={"sub": str(user_row["id"]), "role": user_row["role"]})
-        refresh_token = create_refresh_token(data={"sub": str(user_row["id"]), "role": user_row["role"]})
+        jwt_access_token, refresh_token = await create_token_pair_async(user_row)
         
         # 리프레시 토큰을 HttpOnly 쿠키로 설정
-        response.set_cookie(
-            key="refresh_token",
-            value=refresh_token,
-            httponly=True,
-            secure=COOKIE_SECURE,
-            samesite="lax",
-            max_age=REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
-        )
+        response.set_cookie(value=refresh_token, **REFRESH_COOKIE_KWARGS)
         
         logger.info(f"Google OAuth login successful for user: {user_row['username']}")
         return {
@@ -1034,7 +1208,7 @@ async def google_callback(request: GoogleCallbackRequest, response: Response):
         
     except HTTPException:
         raise
-    except requests.RequestException as e:
+    except httpx.RequestError as e:
         raise HTTPException(status_code=500, detail=f"Network error: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -1056,28 +1230,19 @@ def refresh_token(response: Response, refresh_token: str = Cookie(None)):
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid refresh token")
     
-    # 3. 사용자 정보 확인
+    # 3. 사용자 정보 확인 (짧게 캐시된 프로필 사용, 사용자 정보 변경/삭제 시 캐시가 제거되므로 역할/사용자명 변경이 바로 반영됨)
     try:
-        user_result = supabase.table("user").select("*").eq("id", user_id).execute()
-        if not user_result.data:
-            raise HTTPException(status_code=401, detail="User not found")
-        user_row = user_result.data[0]
+        user_row = get_user_profile(user_id)
     except Exception:
         raise HTTPException(status_code=401, detail="User not found")
+    if user_row is None:
+        raise HTTPException(status_code=401, detail="User not found")
     
     # 4. 새로운 토큰 쌍 생성 (토큰 로테이션)
-    new_access_token = create_access_token(data={"sub": str(user_id), "role": user_row["role"]})
-    new_refresh_token = create_refresh_token(data={"sub": str(user_id), "role": user_row["role"]})
+    new_access_token, new_refresh_token = create_token_pair(user_row)
     
     # 5. 새로운 리프레시 토큰을 쿠키로 설정
-    response.set_cookie(
-        key="refresh_token",
-        value=new_refresh_token,
-        httponly=True,
-        secure=COOKIE_SECURE,
-        samesite="lax",
-        max_age=REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60
-    )
+    response.set_cookie(value=new_refresh_token, **REFRESH_COOKIE_KWARGS)
     
     return {
         "access_token": new_access_token,
@@ -1087,12 +1252,7 @@ def refresh_token(response: Response, refresh_token: str = Cookie(None)):
 # 로그아웃 (refresh token 쿠키 삭제)
 @router.post("/logout")
 def logout(response: Response):
-    response.delete_cookie(
-        key="refresh_token",
-        httponly=True,
-        secure=COOKIE_SECURE,
-        samesite="lax"
-    )
+    response.delete_cookie(**REFRESH_COOKIE_DELETE_KWARGS)
     return {"msg": "Logged out successfully"}
 
 # 관리자 전용 테스트 엔드포인트
@@ -1101,28 +1261,53 @@ def admin_only_endpoint(current_user=Depends(admin_required)):
     return {"msg": "관리자만 접근 가능"}
 
 # 현재 로그인한 사용자 정보 조회
+# 사용자 프로필 조회 (AUTH_CACHE_TTL_SECONDS 동안 캐시, 사용자 정보 변경/삭제/이메일 인증 시 invalidate_user_cache로 제거)
+def get_user_profile(user_id: int) -> Optional[dict]:
+    with _auth_cache_lock:
+        cached = _user_profile_cache.get(user_id)
+    if cached is not None:
+        return dict(cached)
+    
+    user_result = supabase.table("user").select("id", "username", "email", "role", "email_verified").eq("id", user_id).execute()
+    if not user_result.data:
+        return None
+    
+    return cache_user_profile(user_result.data[0])
+
+# 최신 사용자 행으로 프로필 캐시 갱신 (DB에서 방금 조회/변경한 행을 그대로 저장)
+def cache_user_profile(user_row: dict) -> dict:
+    profile = {
+        "id": user_row["id"],
+        "username": user_row["username"],
+        "email": user_row["email"],
+        "role": user_row["role"],
+        "email_verified": user_row["email_verified"]
+    }
+    with _auth_cache_lock:
+        _user_profile_cache[profile["id"]] = profile
+    return dict(profile)
+
 @router.get("/me")
 def get_me(current_user=Depends(get_current_user)):
     try:
-        user_result = supabase.table("user").select("id", "username", "email", "role").eq("id", current_user["id"]).execute()
-        if not user_result.data:
-            raise HTTPException(status_code=401, detail="User not found")
-        user_row = user_result.data[0]
-        return {
-            "id": user_row["id"],
-            "username": user_row["username"],
-            "email": user_row["email"],
-            "role": user_row["role"]
-        }
+        profile = get_user_profile(current_user["id"])
     except Exception:
         raise HTTPException(status_code=401, detail="User not found")
+    if profile is None:
+        raise HTTPException(status_code=401, detail="User not found")
+    return {
+        "id": profile["id"],
+        "username": profile["username"],
+        "email": profile["email"],
+        "role": profile["role"]
+    }
 
 # 사용자 정보 수정 (사용자명만 수정 가능, 비밀번호 확인 필수)
 @router.put("/me")
 def update_me(user_update: UserUpdate, current_user=Depends(get_current_user)):
     try:
         # 현재 사용자 정보 조회 (비밀번호 해시 포함)
-        user_result = supabase.table("user").select("*").eq("id", current_user["id"]).execute()
+        user_result = supabase.table("user").select("username", "password_hash").eq("id", current_user["id"]).execute()
         if not user_result.data:
             raise HTTPException(status_code=404, detail="User not found")
         
@@ -1139,21 +1324,23 @@ def update_me(user_update: UserUpdate, current_user=Depends(get_current_user)):
         if not verify_password(user_update.current_password, user_row["password_hash"]):
             raise HTTPException(status_code=400, detail="Current password is incorrect")
         
-        # 사용자명 중복 체크 (자기 자신 제외)
-        username_result = supabase.table("user").select("id").eq("username", user_update.username).neq("id", current_user["id"]).execute()
-        if username_result.data:
-            raise HTTPException(status_code=400, detail="Username already exists")
-        
         # 사용자명이 현재와 동일한지 확인
         if user_update.username == user_row["username"]:
             raise HTTPException(status_code=400, detail="New username is the same as current username")
         
-        # 사용자명 업데이트
-        update_result = supabase.table("user").update({"username": user_update.username}).eq("id", current_user["id"]).execute()
+        # 사용자명 업데이트 (중복 여부는 별도 조회 없이 username UNIQUE 제약조건으로 판단)
+        try:
+            update_result = supabase.table("user").update({"username": user_update.username}).eq("id", current_user["id"]).select("id", "username", "email", "role").execute()
+        except APIError as e:
+            if e.code == UNIQUE_VIOLATION:
+                raise HTTPException(status_code=400, detail="Username already exists")
+            raise
         
         if not update_result.data:
             raise HTTPException(status_code=500, detail="Failed to update username")
         
+        invalidate_user_cache(current_user["id"])
+        
         # 업데이트된 사용자 정보 반환
         updated_user = update_result.data[0]
         return {
@@ -1191,12 +1378,13 @@ def change_password(password_change: PasswordChange, current_user=Depends(get_cu
         # 새 비밀번호 해싱
         new_password_hash = get_password_hash(password_change.new_password)
         
-        # 비밀번호 업데이트
-        update_result = supabase.table("user").update({"password_hash": new_password_hash}).eq("id", current_user["id"]).execute()
+        # 비밀번호 업데이트 (갱신 여부 확인용으로 id만 반환받음)
+        update_result = supabase.table("user").update({"password_hash": new_password_hash}).eq("id", current_user["id"]).select("id").execute()
         
         if not update_result.data:
             raise HTTPException(status_code=500, detail="Failed to update password")
         
+        invalidate_user_cache(current_user["id"])  # 비밀번호 변경 이전에 발급된 액세스 토큰 무효화
         return {"message": "Password changed successfully"}
         
     except HTTPException:
@@ -1210,28 +1398,15 @@ def delete_account(current_user=Depends(get_current_user)):
     try:
         user_id = current_user["id"]
         
-        # 관련 데이터 연쇄 삭제 (트랜잭션처럼 처리)
-        # 1. 투표 기록 삭제
-        supabase.table("review_vote").delete().eq("user_id", user_id).execute()
-        supabase.table("post_vote").delete().eq("user_id", user_id).execute()
-        supabase.table("phishing_vote").delete().eq("user_id", user_id).execute()
-        
-        # 2. 댓글 삭제
-        supabase.table("review_comment").delete().eq("user_id", user_id).execute()
-        supabase.table("post_comment").delete().eq("user_id", user_id).execute()
-        supabase.table("phishing_comment").delete().eq("user_id", user_id).execute()
-        
-        # 3. 게시물/리뷰/피싱 신고 삭제
-        supabase.table("post").delete().eq("user_id", user_id).execute()
-        supabase.table("review").delete().eq("user_id", user_id).execute()
-        supabase.table("phishing_site").delete().eq("user_id", user_id).execute()
-        
-        # 4. 사용자 계정 삭제
-        delete_result = supabase.table("user").delete().eq("id", user_id).execute()
+        # 관련 데이터 연쇄 삭제 (DB 함수에서 하나의 트랜잭션으로 처리, migrations/001_delete_user_cascade.sql)
+        # 투표 기록 -> 댓글 -> 게시물/리뷰/피싱 신고 -> 사용자 계정 순서로 삭제
+        delete_result = supabase.rpc("delete_user_cascade", {"p_user_id": user_id}).execute()
         
         if not delete_result.data:
             raise HTTPException(status_code=500, detail="Failed to delete account")
         
+        invalidate_user_cache(user_id)
+        
         return {"message": "Account deleted successfully"}
         
     except HTTPException:
@@ -1241,7 +1416,7 @@ def delete_account(current_user=Depends(get_current_user)):
 
 # 기존 인증 코드 재발송 엔드포인트 (Deprecated - /send-verification-email 사용 권장)
 @router.post("/resend-verification-code")
-def resend_verification_code(user: UserLogin):
+def resend_verification_code(user: UserLogin, background_tasks: BackgroundTasks):
     """
     Deprecated: Use /send-verification-email instead
     
@@ -1249,19 +1424,19 @@ def resend_verification_code(user: UserLogin):
     일관성을 위해 /send-verification-email 사용을 권장합니다.
     """
     # 동일한 로직을 /send-verification-email로 위임
-    return send_verification_email_api(user)
+    return send_verification_email_api(user, background_tasks)
 
 # 이메일 인증 메일 발송 (이메일+패스워드 인증으로 통일)
 @router.post("/send-verification-email")
-def send_verification_email_api(user_login: UserLogin):
+def send_verification_email_api(user_login: UserLogin, background_tasks: BackgroundTasks):
     """
     이메일 인증 코드 발송 - 이메일+패스워드로 본인 확인
     - 미인증 사용자가 JWT 토큰 없이도 사용 가능
-    - 신규 회원가입과 동일한 플로우 제공
+    - 신규 회원가입과 동일한 플로우 제공 (응답 후 백그라운드에서 발송)
     """
     try:
         # 사용자 확인
-        user_result = supabase.table("user").select("*").eq("email", user_login.email).execute()
+        user_result = supabase.table("user").select("id", "username", "email", "email_verified", "password_hash").eq("email", user_login.email).execute()
         if not user_result.data:
             raise HTTPException(status_code=404, detail="User not found")
         
@@ -1279,7 +1454,7 @@ def send_verification_email_api(user_login: UserLogin):
         user_id = user_row["id"]
         code = create_email_verification_code(user_id)
         
-        send_verification_code_email(user_row["email"], user_row["username"], code)  # 이제 항상 True 반환
+        background_tasks.add_task(send_verification_code_email, user_row["email"], user_row["username"], code)
         return {
             "message": "Verification code email sent successfully",
             "email": user_row["email"],
@@ -1300,42 +1475,36 @@ def send_verification_email_api(user_login: UserLogin):
 # 이메일 인증 코드 처리
 @router.post("/verify-email-code")
 def verify_email_code_api(request: EmailVerificationCode):
-    try:
-        # 코드 검증
-        user_id = verify_email_verification_code(request.code)
-        if not user_id:
-            raise HTTPException(status_code=400, detail="Invalid or expired verification code")
-        
-        # 사용자 이메일 인증 상태 업데이트
-        update_result = supabase.table("user").update({"email_verified": True}).eq("id", user_id).execute()
-        
-        if not update_result.data:
-            raise HTTPException(status_code=500, detail="Failed to verify email")
-        
-        # 사용된 코드 삭제
-        supabase.table("email_verification_token").delete().eq("token", request.code).execute()
-        
-        return {"message": "Email verified successfully"}
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to verify email: {str(e)}")
+    # 예상치 못한 오류는 전역 예외 처리기(main.py)에서 로그 후 500 응답
+    # 코드 검증 + 이메일 인증 상태 업데이트 + 사용된 코드 만료 처리를 한 번의 DB 함수 호출로 처리
+    # 방금 사용된 코드의 재요청(중복 클릭, 재시도)은 어느 워커에서 처리해도 DB 함수가 같은 사용자 ID 반환
+    # (migrations/013_verify_email_code_idempotent.sql)
+    verify_result = supabase.rpc("verify_email_code", {
+        "p_code": request.code,
+        "p_replay_seconds": VERIFIED_CODE_DEDUPE_SECONDS
+    }).execute()
+    if not verify_result.data:
+        raise HTTPException(status_code=400, detail="Invalid or expired verification code")
+    
+    invalidate_user_cache(verify_result.data, revoke_tokens=False)  # 캐시된 미인증 상태 제거 (인증 상태를 폴링 중인 토큰은 계속 사용 가능)
+    return {"message": "Email verified successfully"}
+
+# 이메일 인증 상태 확인 (인증 여부별 고정 ETag로 조건부 요청 지원)
+EMAIL_VERIFIED_ETAG = 'W/"ev-1"'
+EMAIL_UNVERIFIED_ETAG = 'W/"ev-0"'
 
-# 이메일 인증 상태 확인
 @router.get("/email-verification-status")
-def get_email_verification_status(current_user=Depends(get_current_user)):
-    try:
-        user_result = supabase.table("user").select("email_verified").eq("id", current_user["id"]).execute()
-        if not user_result.data:
-            raise HTTPException(status_code=404, detail="User not found")
-        
-        return {"email_verified": user_result.data[0]["email_verified"]}
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get verification status: {str(e)}")
+async def get_email_verification_status(request: Request, current_user=Depends(get_authenticated_user)):
+    # 미인증 사용자도 폴링할 수 있도록 이메일 인증을 요구하지 않는 의존성 사용
+    # get_authenticated_user에서 이미 조회한 값(사용자 프로필 캐시)을 그대로 사용 (추가 DB 조회 없음)
+    email_verified = current_user["email_verified"]
+    etag = EMAIL_VERIFIED_ETAG if email_verified else EMAIL_UNVERIFIED_ETAG
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    
+    # 폴링 시 상태가 바뀌지 않았으면 본문 없이 304 응답
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return ORJSONResponse({"email_verified": email_verified}, headers=headers)
 
 # TTL 관련 관리자 API들
 @router.post("/admin/cleanup-unverified-accounts")
@@ -1361,18 +1530,17 @@ def get_unverified_accounts_status(current_user=Depends(admin_required)):
     - TTL 만료 예정 계정 수
     """
     try:
-        # 전체 미인증 계정 수
-        total_unverified = supabase.table("user").select("id", count="exact").eq("email_verified", False).execute()
-        
-        # TTL 만료 예정 계정 수 (현재 시간 기준)
-        ttl_threshold = datetime.utcnow() - timedelta(hours=UNVERIFIED_ACCOUNT_TTL_HOURS)
+        # TTL 만료 예정 계정 수 기준 시점 (현재 시간 기준)
+        ttl_threshold = datetime.now(timezone.utc) - timedelta(hours=UNVERIFIED_ACCOUNT_TTL_HOURS)
         ttl_threshold_iso = ttl_threshold.isoformat()
         
-        expired_unverified = supabase.table("user").select("id", count="exact").eq("email_verified", False).lt("created_at", ttl_threshold_iso).execute()
+        # 전체 미인증 계정 수와 TTL 만료 예정 계정 수를 한 번의 DB 함수 호출로 집계 (migrations/011_unverified_status.sql)
+        status_result = supabase.rpc("unverified_status", {"p_threshold": ttl_threshold_iso}).execute()
+        counts = status_result.data[0] if status_result.data else {"total": 0, "expired": 0}
         
         return {
-            "total_unverified_accounts": total_unverified.count,
-            "expired_accounts_ready_for_cleanup": expired_unverified.count,
+            "total_unverified_accounts": counts["total"],
+            "expired_accounts_ready_for_cleanup": counts["expired"],
             "ttl_hours": UNVERIFIED_ACCOUNT_TTL_HOURS,
             "cleanup_schedule_hours": CLEANUP_SCHEDULE_HOURS
         }
@@ -1382,11 +1550,11 @@ def get_unverified_accounts_status(current_user=Depends(admin_required)):
 
 # 비밀번호 찾기 (재설정 코드 발송)
 @router.post("/forgot-password")
-def forgot_password(request: PasswordResetRequest):
+def forgot_password(request: PasswordResetRequest, background_tasks: BackgroundTasks):
     """
     비밀번호 찾기 - 이메일로 재설정 코드 발송 (보안상 항상 성공 응답)
     - 존재하지 않는 이메일이어도 성공 응답으로 정보 노출 방지
-    - 유효한 계정에만 실제로 코드 발송
+    - 유효한 계정에만 실제로 코드 발송 (코드 저장과 발송 모두 응답 후 백그라운드에서 처리하므로 모든 요청이 사용자 조회 1회 후 응답)
     - Google OAuth 계정 및 미인증 계정은 코드 발송 안함
     """
     try:
@@ -1398,7 +1566,7 @@ def forgot_password(request: PasswordResetRequest):
         
         # 사용자 확인 (이메일 기반) - 실패해도 에러 발생시키지 않음
         try:
-            user_result = supabase.table("user").select("*").eq("email", request.email).execute()
+            user_result = supabase.table("user").select("id", "username", "email_verified", "password_hash").eq("email", request.email).execute()
             if not user_result.data:
                 logger.info(f"Password reset requested for non-existent email: {request.email}")
                 return response_message  # 존재하지 않는 이메일이어도 성공 응답
@@ -1415,12 +1583,10 @@ def forgot_password(request: PasswordResetRequest):
                 logger.info(f"Password reset requested for Google OAuth account: {request.email}")
                 return response_message  # Google OAuth 계정이어도 성공 응답
             
-            # 유효한 계정에만 실제로 코드 생성 및 발송
-            user_id = user_row["id"]
-            code = create_email_verification_code(user_id)
-            send_password_reset_email(request.email, user_row["username"], code)  # 실패해도 예외 발생 안함
+            # 유효한 계정에만 실제로 코드 생성 및 발송 (코드 저장도 응답 후 백그라운드에서 처리)
+            background_tasks.add_task(_issue_password_reset_code, user_row["id"], request.email, user_row["username"])
             
-            logger.info(f"Password reset code sent to valid account: {request.email}")
+            logger.info(f"Password reset code queued for valid account: {request.email}")
             
         except Exception as e:
             logger.warning(f"Error processing password reset for {request.email}: {str(e)}")
@@ -1436,6 +1602,14 @@ def forgot_password(request: PasswordResetRequest):
             "email": request.email
         }
 
+# 비밀번호 재설정 코드 생성 및 발송 (forgot_password 응답 후 백그라운드에서 실행, 실패해도 예외 발생 안함)
+def _issue_password_reset_code(user_id: int, email: str, username: str):
+    try:
+        code = create_email_verification_code(user_id)
+    except HTTPException:
+        return  # create_email_verification_code에서 이미 로그 기록
+    send_password_reset_email(email, username, code)
+
 # 비밀번호 재설정 완료
 @router.post("/reset-password")
 def reset_password(request: PasswordResetComplete):
@@ -1447,7 +1621,7 @@ def reset_password(request: PasswordResetComplete):
     """
     try:
         # 사용자 확인 (이메일 기반)
-        user_result = supabase.table("user").select("*").eq("email", request.email).execute()
+        user_result = supabase.table("user").select("id", "password_hash").eq("email", request.email).execute()
         if not user_result.data:
             raise HTTPException(status_code=404, detail="User not found with this email")
         
@@ -1468,15 +1642,16 @@ def reset_password(request: PasswordResetComplete):
         # 새 비밀번호 해싱
         new_password_hash = get_password_hash(request.new_password)
         
-        # 비밀번호 업데이트
-        update_result = supabase.table("user").update({"password_hash": new_password_hash}).eq("id", user_id).execute()
+        # 비밀번호 업데이트 (갱신 여부 확인용으로 id만 반환받음)
+        update_result = supabase.table("user").update({"password_hash": new_password_hash}).eq("id", user_id).select("id").execute()
         
         if not update_result.data:
             raise HTTPException(status_code=500, detail="Failed to reset password")
         
         # 사용된 재설정 코드 삭제
-        supabase.table("email_verification_token").delete().eq("user_id", user_id).execute()
+        supabase.table("email_verification_token").delete(returning=ReturnMethod.minimal).eq("user_id", user_id).execute()
         
+        invalidate_user_cache(user_id)  # 비밀번호 재설정 이전에 발급된 액세스 토큰 무효화
         return {
             "message": "Password reset successfully. You can now login with your new password."
         }
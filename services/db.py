@@ -9,14 +9,16 @@
 
 import os
 import logging
+import httpx
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from supabase import create_client, Client, ClientOptions
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
 # 환경변수 로드
-load_dotenv()
+if os.getenv("ENVIRONMENT") != "production":  # 운영 환경은 컨테이너 환경변수 사용
+    load_dotenv()
 
 # Supabase 연결 설정
 SUPABASE_URL = os.getenv("SUPABASE_URL")
@@ -25,7 +27,24 @@ SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY")
 if not SUPABASE_URL or not SUPABASE_ANON_KEY:
     raise RuntimeError("SUPABASE_URL and SUPABASE_ANON_KEY must be set in .env")
 
+# Supabase HTTP 연결 풀 설정 (스레드풀의 동시 요청 수 이상으로 설정)
+SUPABASE_MAX_CONNECTIONS = int(os.getenv("SUPABASE_MAX_CONNECTIONS", "100"))
+SUPABASE_KEEPALIVE_EXPIRY_SECONDS = 300  # 유휴 연결 유지 시간 (TLS 핸드셰이크 반복 방지)
+SUPABASE_HTTP_TIMEOUT_SECONDS = 30  # Supabase 응답 대기 타임아웃
+
+# DB(PostgREST)/Storage/Auth 호출이 공유하는 HTTP/2 연결 풀 (프로세스당 하나)
+supabase_http_client = httpx.Client(
+    http2=True,
+    follow_redirects=True,
+    timeout=SUPABASE_HTTP_TIMEOUT_SECONDS,
+    limits=httpx.Limits(
+        max_connections=SUPABASE_MAX_CONNECTIONS,
+        max_keepalive_connections=SUPABASE_MAX_CONNECTIONS,
+        keepalive_expiry=SUPABASE_KEEPALIVE_EXPIRY_SECONDS,
+    ),
+)
+
 # Supabase 클라이언트 인스턴스 생성
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
+supabase: Client = create_client(SUPABASE_URL, SUPABASE_ANON_KEY, options=ClientOptions(httpx_client=supabase_http_client))
 
 logger.info("Supabase client initialized successfully")
\ No newline at end of file
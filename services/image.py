@@ -17,6 +17,8 @@ STORAGE_BUCKET = "images"
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB 제한
 ALLOWED_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".webp"}
 ALLOWED_MIME_TYPES = {"image/png", "image/jpeg", "image/gif", "image/webp"}
+# 업로드 파일명은 타임스탬프+UUID로 고유하므로 내용이 바뀌지 않음 → CDN/브라우저 장기 캐시 (1년)
+STORAGE_CACHE_CONTROL = "31536000"
 
 # 이미지 최적화 설정
 MAX_IMAGE_WIDTH = 1920
@@ -122,7 +124,7 @@ async def upload_image(file: UploadFile = File(...)):
                 file=optimized_content,
                 file_options={
                     "content-type": f"image/{image_format}",
-                    "cache-control": "3600"
+                    "cache-control": STORAGE_CACHE_CONTROL
                 }
             )
             
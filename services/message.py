@@ -11,7 +11,7 @@ import logging
 from datetime import datetime
 from typing import Optional, List
 from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, field_validator
 from .db import supabase
 from .auth import get_current_user
 
@@ -30,7 +30,8 @@ class MessageSend(BaseModel):
     subject: str
     content: str
     
-    @validator('receiver_username')
+    @field_validator('receiver_username')
+    @classmethod
     def validate_receiver_username(cls, v):
         if len(v) < 3 or len(v) > 20:
             raise ValueError('수신자 사용자명은 3-20자 사이여야 합니다')
@@ -38,7 +39,8 @@ class MessageSend(BaseModel):
             raise ValueError('수신자 사용자명은 영문자와 숫자만 허용됩니다')
         return v
     
-    @validator('subject')
+    @field_validator('subject')
+    @classmethod
     def validate_subject(cls, v):
         if len(v.strip()) == 0:
             raise ValueError('제목을 입력해주세요')
@@ -46,7 +48,8 @@ class MessageSend(BaseModel):
             raise ValueError('제목은 100자 이내로 입력해주세요')
         return v.strip()
     
-    @validator('content')
+    @field_validator('content')
+    @classmethod
     def validate_content(cls, v):
         if len(v.strip()) == 0:
             raise ValueError('내용을 입력해주세요')
@@ -70,7 +73,8 @@ class UserMemo(BaseModel):
     target_username: str
     memo: str
     
-    @validator('target_username')
+    @field_validator('target_username')
+    @classmethod
     def validate_target_username(cls, v):
         if len(v) < 3 or len(v) > 20:
             raise ValueError('대상 사용자명은 3-20자 사이여야 합니다')
@@ -78,7 +82,8 @@ class UserMemo(BaseModel):
             raise ValueError('대상 사용자명은 영문자와 숫자만 허용됩니다')
         return v
     
-    @validator('memo')
+    @field_validator('memo')
+    @classmethod
     def validate_memo(cls, v):
         if len(v.strip()) == 0:
             raise ValueError('메모 내용을 입력해주세요')